@@ -1,8 +1,9 @@
 # Library Imports
 import streamlit as st
-import plotly.express as p
 from utils.styling import apply_styling
-from utils.data_processing import create_bleaching_heatmap, create_kmeans_analysis, create_bleaching_dashboard, create_management_analysis, create_gbr_forecast, create_climate_timeline, create_protection_treemap
+from utils.assets import render_image
+from utils.page_content import PAGE
+from utils.data_processing import get_scatter_filter_options, SCATTER_DRIVERS, get_recovery_groupings, RECOVERY_GROUPINGS, get_bleaching_year_bounds, start_data_watcher, start_background_loading, LINK_DISTANCES, LINK_WINDOWS, CORRELATION_DATASETS
 
 # Configure page layout
 st.set_page_config(layout="wide")
@@ -10,284 +11,141 @@ st.set_page_config(layout="wide")
 # Apply styling
 apply_styling()
 
+# Refresh cached charts when files under data/ change
+start_data_watcher()
 
-col1, col2, col3 = st.columns([1, 4, 1])
-with col2:
+# Load the data behind every chart in the background while the narrative renders (once per session);
+# each chart then comes from the caches, so a session still picks up data files that change later
+background = start_background_loading()
 
-    # Main container for entire page
-    with st.container():
-        # TITLE
+# Background load each chart waits for before it renders
+BACKGROUND_KEYS = {
+    "climate_timeline": "timeline",
+    "bleaching_heatmap": "heatmap",
+    "bleaching_dashboard": "dashboard",
+    "site_scatter": "scatter",
+    "bleaching_distribution": "distribution",
+    "management_analysis": "management",
+    "recovery_rates": "recovery",
+    "severity_recovery": "links",
+    "gbr_forecast": "gbr",
+}
 
-        st.markdown("\n")
 
-        st.title("GUARDIANS OF THE SEA: CORAL REEFS")
+# Viz 3
+def dashboard_controls():
+    first_year, last_year = get_bleaching_year_bounds()
+    return (st.slider("Survey years", first_year, last_year, (first_year, last_year), key="dashboard_years"),)
 
 
-        st.divider()
+# Viz 7
+def scatter_controls():
+    countries, min_year, max_year = get_scatter_filter_options()
 
+    filter_col1, filter_col2, filter_col3 = st.columns([1, 2, 2])
+    with filter_col1:
+        driver = st.selectbox("Environmental driver", list(SCATTER_DRIVERS), format_func=SCATTER_DRIVERS.get)
+    with filter_col2:
+        selected_countries = st.multiselect("Countries", countries, placeholder="All countries")
+    with filter_col3:
+        year_range = st.slider("Years", min_year, max_year, (min_year, max_year), key="scatter_years")
+    return driver, tuple(selected_countries), year_range
 
-    st.markdown("\n")
 
-    col1, col2, col3 = st.columns([1, 6, 1])
-    with col2:
-        st.image("utils/salmon-teal-coral-reef.png", use_container_width=True)
-    st.markdown("\n")
+# Viz 9
+def distribution_controls():
+    first_year, last_year = get_bleaching_year_bounds()
+    return (st.slider("Survey years", first_year, last_year, (first_year, last_year), key="distribution_years"),)
 
-    # Intro
-    st.markdown("""
-    ## From Bright to White: The Journey of Coral Bleaching
 
-    Coral reefs are often called the rainforests of the ocean. Though they cover less than 1% of the seafloor, they support nearly a quarter of all marine life, providing shelter and breeding grounds for countless species.
+# Viz 11
+def correlation_controls():
+    return (st.radio("Dataset", list(CORRELATION_DATASETS), format_func=CORRELATION_DATASETS.get, horizontal=True),)
 
-    They act as natural barriers, protecting coastlines from storms and erosion, and they sustain fisheries and food security for millions of people worldwide. Reefs also fuel local economies through tourism, diving, and recreation, while inspiring scientific discovery and cultural heritage.
 
-    In short, coral reefs are a foundation of marine biodiversity, coastal protection, and human well-being — making them one of Earth’s most valuable ecosystems.
+# Viz 8
+def recovery_controls():
+    return (st.selectbox("Compare recovery by", get_recovery_groupings(), format_func=RECOVERY_GROUPINGS.get),)
 
-    """)
 
-    st.info("An estimated **25% of all marine life**, including over 4,000 species of fish, are dependent on coral reefs at some point in their life cycle. **- *U.S. Environmental Protection Agency***")
+# Viz 10
+def link_controls():
+    link_col1, link_col2 = st.columns(2)
+    with link_col1:
+        max_km = st.select_slider("Recovery sites within (km)", LINK_DISTANCES, value=25)
+    with link_col2:
+        window_years = st.select_slider("Years after bleaching", LINK_WINDOWS, value=5)
+    return max_km, window_years
 
-    st.markdown("""
-    ## The Bleaching Crisis
 
-    Coral reefs around the world have been significantly affected by the rise of global temperatures, changes in the climate, and general pollution of the environment and our oceans—undergoing a transformation known as **coral bleaching**.
+# Widgets rendered above a chart; they return the arguments for its builder
+CHART_CONTROLS = {
+    "bleaching_dashboard": dashboard_controls,
+    "site_scatter": scatter_controls,
+    "bleaching_distribution": distribution_controls,
+    "feature_correlations": correlation_controls,
+    "recovery_rates": recovery_controls,
+    "severity_recovery": link_controls,
+}
 
-    Coral bleaching occurs when corals become stressed by changes in their environment, most commonly:
-    -  **Elevated sea temperatures**
-    -  **Increased UV radiation**
-    -  **Poor water quality and pollution**
-
-    During bleaching, corals become transparent—revealing their white skeletons. While bleached corals are still alive, they are significantly weakened and more vulnerable to starvation, disease, and even death.
-    """)
-
-    st.info(" **The Ripple Effect**: When reefs die, fish populations decline, marine food webs collapse, coastal communities lose tourism income, and natural storm protection weakens.")
-
-    st.markdown("""
-    ## Global Climate Events Timeline""")
 
+def render_chart(block):
+    st.markdown(f"## {block['heading']}")
+    if "intro" in block:
+        st.markdown(block["intro"])
     st.markdown("\n")
 
     with st.container():
-        with st.spinner("Loading climate timeline..."):
-            fig = create_climate_timeline()
+        if block["key"] in BACKGROUND_KEYS:
+            with st.spinner(block["spinner"]):
+                background[BACKGROUND_KEYS[block["key"]]].result()
+        controls = CHART_CONTROLS.get(block["key"])
+        args = controls() if controls else ()
+
+        with st.spinner(block["spinner"]):
+            fig = block["builder"](*args)
             st.plotly_chart(fig)
 
-        st.markdown("""
-        📊 **What it shows:** An annotated timeline of major global climate events and stressors that have impacted coral reefs, highlighting periods of widespread bleaching and ecological stress.
-                    
-        🔎 **Meaning:** By overlaying real-world events on the timeline, this chart connects the data directly to human and ecological consequences, showing how global climate events have influenced coral reef health over time.
-        """)
-
-
-    st.divider()
-
+        st.markdown(block["caption"])
 
-    # Datasets
-    st.header("Dataset Introduction")
 
+def render_block(block):
+    kind = block["kind"]
+    if kind == "title":
+        st.markdown("\n")
+        st.title(block["text"])
+    elif kind == "image":
+        st.markdown("\n")
+        col1, col2, col3 = st.columns([1, 6, 1])
+        with col2:
+            render_image(block["source"], alt=block["alt"])
+        st.markdown("\n")
+    elif kind == "markdown":
+        st.markdown(block["text"])
+    elif kind == "info":
+        st.info(block["text"])
+    elif kind == "columns":
+        for col, text in zip(st.columns(len(block["texts"])), block["texts"]):
+            with col:
+                st.markdown(text)
+    elif kind == "divider":
+        st.divider()
+    elif kind == "logos":
+        st.markdown("\n")
+        st.markdown("\n")
+        for col, source in zip(st.columns(len(block["sources"])), block["sources"]):
+            with col:
+                render_image(source, width=block["width"])
+    elif kind == "chart":
+        render_chart(block)
 
-    st.markdown("""
-    To understand the global coral crisis, we analyze two comprehensive datasets that capture both the **destruction** and **recovery** of coral reefs worldwide.
-    """)
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.subheader("[Coral Bleaching Dataset](https://www.bco-dmo.org/dataset/773466)")
-        st.markdown("""
-        **Focus**: Bleaching events and environmental stressors
-        
-        This dataset tracks coral bleaching presence/absence across global reef sites, enabling comparative analyses and determination of geographical bleaching thresholds.
-        
-        **Key Variables**:
-        - Site exposure and distance to land
-        - Mean turbidity and cyclone frequency  
-        - Sea-surface temperature metrics
-        - Bleaching severity indicators
-        """)
-        
-    with col2:
-        st.subheader("[Coral Recovery Dataset](https://www.bco-dmo.org/dataset/933334)")
-        st.markdown("""
-        **Focus**: Recovery patterns following disturbances
-        
-        The Heatwaves and Coral-Recovery Database (HeatCRD) - the most comprehensive reference on coral recovery following marine heatwaves and other disturbances.
-        
-        **Key Variables**:
-        - Coral cover percentages over time
-        - MPA descriptions and protection status
-        - Temperature and thermal stress indicators
-        - Recovery rates and timelines
-        """)
 
-    st.info("📈 **Combined Power**: 29,205+ data records spanning 44 years from 12,266 sites across 83 countries")
+col1, col2, col3 = st.columns([1, 4, 1])
+with col2:
 
     # Fix info box text visibility - black for both themes and increase font size
     st.markdown('<style>.stAlert > div { color: black !important; font-size: 20px !important; } .stAlert .stMarkdown p { font-size: 20px !important; } .stAlert div[data-testid="stMarkdownContainer"] p { font-size: 20px !important; }</style>', unsafe_allow_html=True)
 
-    st.divider()
-
-    # Viz 1
-    st.markdown("## Coral Bleaching Over The Years")
-
-    st.markdown("\n")
-
-    with st.container():
-        with st.spinner("Loading bleaching visualization..."):
-            fig = create_bleaching_heatmap()
-            st.plotly_chart(fig)
-
-        st.markdown("""
-        📊 **What it shows:**
-        A timeline of bleaching events across global reef locations since 2000, highlighting peaks in mass bleaching years.
-
-        🔎 **Meaning:**
-        This visualization communicates the alarming trend — bleaching is no longer rare. It's happening more frequently and with greater intensity, linked to global temperature rise. This chart also highlights the geographic hotspots, such as the Caribbean, Great Barrier Reef, and Indo-Pacific. It underlines that bleaching is not an isolated issue — it's a global climate crisis.
-        """)
-
-    st.divider()
-
-
-
-    # Viz 3
-    st.markdown("## Coral Bleaching and Environmental Correlation")
-
-    st.markdown("\n")
-
-    with st.container():
-        with st.spinner("Loading environmental correlation dashboard..."):
-            fig = create_bleaching_dashboard()
-            st.plotly_chart(fig)
-
-        st.markdown("""
-        📊 **What it shows:**
-        Correlation of bleaching with exposure levels, sea temperature, turbidity, and windspeed
-
-        🔎 **Meaning:**
-        Temperature rise is the strongest driver, but local conditions like water clarity and wind patterns amplify vulnerability — proving the need for both global and local action.
-        """)
-
-    st.divider()
-
-    st.markdown("## From White to Bright: The Journey of Coral Recovery")
-
-    st.markdown("\n")
-
-    st.markdown("""
-    Coral reef recovery after bleaching is essential to restore ecosystem health and stability. Recovery allows corals to regain their symbiotic algae, rebuild structures, and strengthen resilience to rising temperatures. It also supports effective restoration efforts, ensuring reefs can sustain marine life and recover their vital ecological functions.
-
-    """)
-
-    st.divider()
-
-
-    # Viz 2
-    st.markdown("## Factors Driving Coral Recovery")
-
-    st.markdown("\n")
-
-    with st.container():
-        with st.spinner("Loading K-means analysis..."):
-            fig = create_kmeans_analysis()
-            st.plotly_chart(fig)
-
-        st.markdown("""
-        📊 **What it shows:**
-        Four key factors driving coral recovery: geographic location, temperature patterns, macroalgal competition, and depth
-
-        🔎 **Meaning:**
-        Geographic location dominates recovery patterns, explaining why some reefs are more resilient. Depth offers refuge in deeper waters, while algal competition threatens weakened corals post-bleaching. These insights guide targeted conservation — protecting deeper areas, controlling algal growth, and maintaining water quality can significantly improve recovery success for the 25% of marine life dependent on reefs.
-        """)
-
-    st.divider()
-
-    # Viz 4
-    st.markdown("## Management Authority Effectiveness")
-
-    st.markdown("\n")
-
-    with st.container():
-        with st.spinner("Loading management analysis..."):
-            fig = create_management_analysis()
-            st.plotly_chart(fig)
-
-        st.markdown("""
-        📊 **What it shows:** Recovery rates across different management approaches, with local/regional authorities achieving highest success (40%) and fisheries management close behind (35-40%).
-
-        🔎 **Meaning:** Localized management outperforms broad strategies because it addresses specific reef needs—controlling macroalgae, managing local stressors, and empowering communities. While global climate action remains crucial, these findings suggest that successful coral conservation depends on tailored, community-driven approaches that complement geographic and environmental factors.
-        """)
-
-    st.divider()
-
-    # Viz 5
-    st.markdown("## Great Barrier Reef Forecast")
-
-
-    st.markdown("""
-    The Great Barrier Reef, the world's largest reef system, has faced severe bleaching events. We forecasted recovery across the reef, highlighting areas with potential for rebound and the importance of targeted conservation and climate action.
-    """)
-
-    st.markdown("\n")
-
-    with st.container():
-        with st.spinner("Loading GBR forecast..."):
-            fig = create_gbr_forecast()
-            st.plotly_chart(fig)
-
-        st.markdown("""
-        📊 **What it shows:** Historical coral cover (1992-2020) peaked at 35% in the late 1990s, declined to 20-25% after 2010, with projections showing further decline to 15% by 2030.
-
-        🔎 **Meaning:** The widening confidence interval reflects increasing uncertainty as cumulative bleaching events reduce recovery windows. While the downward trend appears inevitable under current climate trajectories, varying management success rates suggest targeted interventions could moderate this decline, making every conservation effort critical for the reef's survival.
-        """)
-
-    st.divider()
-
-    st.markdown("""
-    ## Conclusion
-
-    As we analyze the patterns of recovery and decline in places like the Great Barrier Reef, we learn so much about the resilience of nature and our role in protecting it. While reefs have shown the ability to recover in the past, the combination of rising temperatures, pollution in the oceans, and more frequent extreme weather events is testing their ability to survive. Analyzing this data isn't just about documenting decline, it's about finding ways to protect and preserve these ecosystems for future generations.
-                                
-    """)
-
-    st.markdown("\n")
-
-    with st.container():
-        with st.spinner("Loading protection strategies..."):
-            fig = create_protection_treemap()
-            st.plotly_chart(fig)
-
-        st.markdown("""
-        📊 **What it shows:** Interactive treemap of coral reef protection strategies organized into global and local actions.
-
-        🔎 **Meaning:** Effective coral protection requires coordinated action at multiple levels - from global climate initiatives to local community management, with each strategy playing a vital role in reef conservation.
-        """)
-        
-
-
-
-    st.markdown("### A reef without color is a warning, not an ending!")
-
-    st.divider()
-
-    st.markdown("## Tools and Tech Used")
-
-    with st.container():
-        st.markdown("\n")
-        st.markdown("\n")
-
-        col1, col2, col3, col4, col5 = st.columns(5)
-
-        with col1:
-            st.image("utils/streamlit.png", width=100)
-            
-        with col2:
-            st.image("utils/Q.jpeg", width=100)
-            
-        with col3:
-            st.image("utils/git.png", width=100)
-            
-        with col4:
-            st.image("utils/deepnote.png", width=100)
-            
-        with col5:
-            st.image("utils/python.png", width=100)
\ No newline at end of file
+    # The story page, shared with the static export (utils/page_content.py)
+    for block in PAGE:
+        render_block(block)
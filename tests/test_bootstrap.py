@@ -0,0 +1,24 @@
+import numpy as np
+
+from utils.bootstrap import grouped_bootstrap_ci
+
+
+def test_confidence_interval_brackets_group_mean():
+    values = np.r_[np.full(50, 10.0), np.arange(50, dtype=float)]
+    groups = ['a'] * 50 + ['b'] * 50
+    ci = grouped_bootstrap_ci(values, groups, n_resamples=200)
+    assert list(ci.index) == ['a', 'b']
+    assert ci.loc['a', ['mean', 'lower', 'upper']].tolist() == [10.0, 10.0, 10.0]
+    assert ci.loc['b', 'lower'] <= ci.loc['b', 'mean'] <= ci.loc['b', 'upper']
+    assert ci['count'].tolist() == [50, 50]
+
+
+def test_empty_range_returns_empty_frame():
+    ci = grouped_bootstrap_ci(np.array([]), np.array([], dtype=object))
+    assert ci.empty
+    assert list(ci.columns) == ['mean', 'lower', 'upper', 'count']
+
+
+def test_rows_without_value_or_group_are_dropped():
+    ci = grouped_bootstrap_ci(np.array([np.nan, 1.0]), np.array(['a', None], dtype=object))
+    assert ci.empty
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from utils.correlation import CovarianceAccumulator, streaming_correlation
+
+
+def _surveys(rows=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(1e3, 5, rows)
+    df = pd.DataFrame({'x': x, 'y': 0.5 * x + rng.normal(0, 1, rows), 'z': rng.uniform(-1, 1, rows)})
+    # Different columns missing in different rows, so every pair has its own set of rows
+    for col, share in [('x', 0.1), ('y', 0.2), ('z', 0.3)]:
+        df.loc[rng.random(rows) < share, col] = np.nan
+    return df
+
+
+def test_streaming_correlation_matches_pandas(tmp_path):
+    df = _surveys()
+    path = tmp_path / "surveys.csv"
+    df.to_csv(path, index=False, float_format='%.17g')
+    corr = streaming_correlation(path, ['x', 'y', 'z', 'absent'], chunksize=700)
+    assert list(corr.columns) == ['x', 'y', 'z']
+    np.testing.assert_allclose(corr.to_numpy(), df.corr().to_numpy(), rtol=0, atol=1e-12)
+
+
+def test_merge_does_not_depend_on_how_rows_are_split():
+    df = _surveys(seed=1)
+    whole = CovarianceAccumulator.from_frame(df, df.columns)
+    parts = CovarianceAccumulator(df.columns)
+    for chunk in np.array_split(np.arange(len(df)), 7):
+        parts.merge(CovarianceAccumulator.from_frame(df.iloc[chunk], df.columns))
+    np.testing.assert_allclose(parts.covariance().to_numpy(), df.cov().to_numpy(), rtol=1e-10)
+    np.testing.assert_allclose(parts.correlation().to_numpy(), whole.correlation().to_numpy(), rtol=0, atol=1e-12)
+
+
+def test_constant_or_sparse_columns_have_no_correlation():
+    df = pd.DataFrame({'x': [1.0, 2.0, 3.0], 'constant': [5.0, 5.0, 5.0], 'single': [np.nan, 1.0, np.nan]})
+    corr = CovarianceAccumulator.from_frame(df, df.columns).correlation()
+    assert corr.loc['x', 'x'] == 1.0
+    assert corr[['constant', 'single']].isna().all().all()
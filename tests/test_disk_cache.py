@@ -0,0 +1,63 @@
+import os
+
+from utils.disk_cache import cache_stats, disk_cache, entry_dir, prune_versions
+
+
+def _cached(tmp_path):
+    path = tmp_path / "surveys.csv"
+    path.write_text("a\n1\n")
+    calls = []
+
+    @disk_cache(str(path), cache_dir=str(tmp_path / "cache"))
+    def total(scale=1):
+        calls.append(scale)
+        return sum(int(line) for line in path.read_text().split()[1:]) * scale
+
+    return path, total, calls
+
+
+def test_entries_are_reused_per_argument(tmp_path):
+    path, total, calls = _cached(tmp_path)
+    # Counters are per process and shared by every test using _cached
+    func_name = f"{total.__module__}.{total.__qualname__}"
+    before = cache_stats().get(func_name, {})
+    assert [total(), total(), total(scale=2), total(scale=2)] == [1, 1, 2, 2]
+    assert calls == [1, 2]
+    stats = cache_stats()[func_name]
+    assert stats["misses"] - before.get("misses", 0) == 2 and stats["hits"] - before.get("hits", 0) == 2
+    assert list(total.recent_calls.values()) == [((), {}), ((), {"scale": 2})]
+
+
+def test_key_changes_with_data_file_contents(tmp_path):
+    path, total, calls = _cached(tmp_path)
+    func_name = f"{total.__module__}.{total.__qualname__}"
+    before = entry_dir(func_name, [str(path)], total.cache_dir)
+    assert total() == 1
+    path.write_text("a\n1\n2\n")
+    after = entry_dir(func_name, [str(path)], total.cache_dir)
+    assert after != before
+    assert total() == 3 and calls == [1, 1]
+    # Written just now, so the previous version is kept for replicas still reading it
+    assert os.path.isdir(before)
+
+
+def test_prune_versions_deletes_only_stale_siblings(tmp_path):
+    parent = tmp_path / "cache" / "func"
+    current, recent, stale = (parent / name for name in ("current", "recent", "stale"))
+    for directory in (current, recent, stale):
+        directory.mkdir(parents=True)
+    os.utime(stale, (0, 0))
+    os.utime(current, (0, 0))
+    prune_versions(str(current), max_age=3600)
+    assert sorted(os.listdir(parent)) == ["current", "recent"]
+
+
+def test_unreadable_entry_is_recomputed(tmp_path):
+    path, total, calls = _cached(tmp_path)
+    assert total() == 1
+    directory = entry_dir(f"{total.__module__}.{total.__qualname__}", [str(path)], total.cache_dir)
+    for name in os.listdir(directory):
+        if name.endswith(".pkl"):
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(b"truncated")
+    assert total() == 1 and calls == [1, 1]
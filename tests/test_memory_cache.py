@@ -0,0 +1,79 @@
+import pickle
+
+import pytest
+
+from utils.memory_cache import CacheManager, memory_cache
+
+
+def _sized(n):
+    # A value whose pickle is a little over n bytes
+    return b"x" * n
+
+
+def test_results_are_reused_and_copied():
+    calls = []
+
+    @memory_cache
+    def load(n):
+        calls.append(n)
+        return [n]
+
+    load.clear()
+    first = load(1)
+    first.append("mutated")
+    assert load(1) == [1] and load(2) == [2]
+    assert calls == [1, 2]
+
+
+def test_key_changes_with_data_file_versions(tmp_path):
+    path = tmp_path / "surveys.csv"
+    path.write_text("a\n1\n")
+    calls = []
+
+    def read():
+        calls.append(1)
+        return path.read_text()
+    read.data_files = (str(path),)
+    read = memory_cache(read)
+
+    read.clear()
+    assert read() == "a\n1\n"
+    assert read() == "a\n1\n" and len(calls) == 1
+    path.write_text("a\n1\n2\n")
+    assert read() == "a\n1\n2\n" and len(calls) == 2
+    path.unlink()
+    with pytest.raises(FileNotFoundError):
+        read()
+
+
+def test_lru_policy_evicts_least_recently_used():
+    size = len(pickle.dumps(_sized(100), protocol=pickle.HIGHEST_PROTOCOL))
+    cache = CacheManager(3 * size, policy="lru")
+    for name in "abc":
+        cache.put((name, b""), _sized(100), cost=1.0)
+    cache.get(("a", b""))
+    cache.put(("d", b""), _sized(100), cost=1.0)
+    assert [cache.get((name, b""))[0] for name in "abcd"] == [True, False, True, True]
+    assert cache.used_bytes == 3 * size
+
+
+def test_cost_policy_keeps_expensive_entries():
+    size = len(pickle.dumps(_sized(100), protocol=pickle.HIGHEST_PROTOCOL))
+    cache = CacheManager(2 * size, policy="cost")
+    cache.put(("slow", b""), _sized(100), cost=10.0)
+    cache.put(("fast", b""), _sized(100), cost=0.01)
+    cache.put(("new", b""), _sized(100), cost=1.0)
+    assert cache.get(("slow", b""))[0] and not cache.get(("fast", b""))[0]
+    assert cache.stats()["fast"]["evictions"] == 1
+
+
+def test_oversized_results_are_not_stored():
+    cache = CacheManager(50)
+    cache.put(("big", b""), _sized(100), cost=1.0)
+    assert cache.get(("big", b"")) == (False, None)
+    assert cache.used_bytes == 0 and cache.stats()["big"]["oversized"] == 1
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        CacheManager(100, policy="fifo")
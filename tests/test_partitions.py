@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.column_store import open_column_store, build_column_store
+from utils.partitions import build_partitions, open_partitions, read_manifest
+
+NUMERIC = ['date_year', 'percent_bleaching']
+CATEGORICAL = ['country_name']
+
+
+@pytest.fixture
+def surveys(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = 3_000
+    df = pd.DataFrame({
+        'country_name': rng.choice(['Australia', 'Fiji', 'Cuba/Mexico', None], rows),
+        'date_year': rng.integers(1996, 2021, rows).astype(float),
+        'percent_bleaching': rng.uniform(0, 100, rows),
+    })
+    df.loc[rng.random(rows) < 0.05, 'date_year'] = np.nan
+    path = tmp_path / "surveys.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def _layout(surveys, tmp_path):
+    store_dir, partition_dir = tmp_path / "store", tmp_path / "partitions"
+    full = open_column_store(build_column_store(surveys, NUMERIC, CATEGORICAL, store_dir))
+    return full, build_partitions(surveys, NUMERIC, CATEGORICAL, partition_dir, store_dir)
+
+
+@pytest.mark.parametrize("countries, year_range", [
+    (None, None),
+    (['Fiji'], None),
+    (['Australia', 'Cuba/Mexico'], (2003, 2011)),
+    (None, (2000, 2000)),
+    (['Nowhere'], None),
+])
+def test_partitions_equal_filtered_full_store(surveys, tmp_path, countries, year_range):
+    full, path = _layout(surveys, tmp_path)
+    expected = full
+    if countries is not None:
+        expected = expected[expected['country_name'].isin(countries)]
+    if year_range is not None:
+        expected = expected[expected['date_year'].between(*year_range)]
+
+    df = open_partitions(path, countries, year_range)
+    # Values are compared without the categorical internals, whose codes on the full store are memory maps
+    pd.testing.assert_frame_equal(df, expected, check_index_type=False, check_categorical=False)
+    assert list(df['country_name'].cat.categories) == list(expected['country_name'].cat.categories)
+
+
+def test_manifest_covers_every_row_once(surveys, tmp_path):
+    full, path = _layout(surveys, tmp_path)
+    manifest = read_manifest(path)
+    assert sum(part['rows'] for part in manifest['partitions']) == manifest['rows'] == len(full)
+    assert {part['country'] for part in manifest['partitions']} == {'Australia', 'Fiji', 'Cuba/Mexico', None}
+    # Rows without a year get their own partition, which a year range never selects
+    assert any(part['bucket'] is None and part['year_min'] is None for part in manifest['partitions'])
+
+
+def test_partitions_are_built_once_per_file_version(surveys, tmp_path):
+    _, path = _layout(surveys, tmp_path)
+    rows = read_manifest(path)['rows']
+    assert _layout(surveys, tmp_path)[1] == path
+    with open(surveys, "a") as f:
+        f.write("Fiji,2020,1.5\n")
+    _, updated = _layout(surveys, tmp_path)
+    assert updated != path
+    assert read_manifest(updated)['rows'] == rows + 1
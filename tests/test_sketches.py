@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from utils.sketches import TDigest, build_digests, merge_digests, quantile_table
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+def _rank_error(values, estimates, quantiles):
+    # Share of the values at or below each estimate, compared with the quantile it should sit at
+    ranks = np.searchsorted(np.sort(values), estimates, side='right') / len(values)
+    return np.abs(ranks - quantiles)
+
+
+def test_quantiles_match_exact_ranks():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=100_000)
+    digest = build_digests(values, pd.DataFrame({'group': np.zeros(len(values), dtype=int)})).iloc[0]
+    assert digest.count == len(values)
+    assert digest.min == values.min() and digest.max == values.max()
+    assert _rank_error(values, digest.quantile(QUANTILES), QUANTILES).max() < 0.005
+
+
+def test_merged_digests_match_one_built_from_all_values():
+    rng = np.random.default_rng(1)
+    values = np.r_[rng.normal(0, 1, 30_000), rng.normal(8, 3, 20_000)]
+    keys = pd.DataFrame({'country': np.repeat(['a', 'b'], [30_000, 20_000]), 'year': rng.integers(2000, 2020, len(values))})
+    digests = build_digests(values, keys)
+    assert digests.index.names == ['country', 'year']
+
+    merged = merge_digests(digests, 'country')
+    table = quantile_table(merged, QUANTILES)
+    assert table['count'].tolist() == [30_000, 20_000]
+    for country, group in zip(['a', 'b'], [values[:30_000], values[30_000:]]):
+        assert _rank_error(group, merged[country].quantile(QUANTILES), QUANTILES).max() < 0.01
+    overall = TDigest.merge(digests)
+    assert _rank_error(values, overall.quantile(QUANTILES), QUANTILES).max() < 0.01
+
+
+def test_rows_without_value_or_key_are_skipped():
+    keys = pd.DataFrame({'country': ['a', 'a', None, 'b']})
+    digests = build_digests([1.0, np.nan, 3.0, 4.0], keys)
+    assert list(digests.index) == ['a', 'b']
+    assert [digest.count for digest in digests] == [1.0, 1.0]
+
+
+def test_empty_input_returns_empty_series_with_key_index():
+    keys = pd.DataFrame({'country': pd.Series([], dtype=object), 'year': pd.Series([], dtype=float)})
+    digests = build_digests([], keys)
+    assert digests.empty
+    assert digests.index.names == ['country', 'year']
+    assert quantile_table(merge_digests(digests, 'country'), QUANTILES).empty
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from utils.sites import normalize_sites
+from utils.spatial_join import EARTH_RADIUS_KM, link_bleaching_to_recovery, link_sites, site_year_keys
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(h))
+
+
+def _coords(rng, n):
+    # Clustered around a few reefs, including one across the antimeridian, so many pairs are near the radius
+    centers = np.array([[-18.0, 147.0], [-17.5, 179.9], [25.0, -80.0]])
+    points = centers[rng.integers(0, len(centers), n)] + rng.normal(0, 0.3, (n, 2))
+    points[:, 1] = (points[:, 1] + 180) % 360 - 180
+    return pd.DataFrame(points, columns=['latitude_degrees', 'longitude_degrees'])
+
+
+def test_link_sites_matches_brute_force_haversine():
+    rng = np.random.default_rng(0)
+    coords_a, coords_b = _coords(rng, 300), _coords(rng, 200)
+    coords_a.iloc[5] = np.nan
+    max_km = 25
+
+    index_a, index_b, distance_km = link_sites(coords_a, coords_b, max_km)
+    all_distances = _haversine(coords_a.to_numpy()[:, [0]], coords_a.to_numpy()[:, [1]],
+                               coords_b.to_numpy()[:, 0], coords_b.to_numpy()[:, 1])
+    np.testing.assert_allclose(distance_km, all_distances[index_a, index_b], rtol=0, atol=1e-6)
+    expected = set(zip(*np.nonzero(all_distances <= max_km)))
+    assert set(zip(index_a, index_b)) == expected
+    assert len(expected) > 100 and 5 not in index_a
+
+
+def test_site_year_keys_search_site_then_year():
+    # A packed site * 10000 + year key would put (0, 10001) between site 1's years
+    cover = site_year_keys(np.array([0, 0, 1, 1]), np.array([2000.0, 10001.0, 1.0, 3.0]))
+    assert np.searchsorted(cover, site_year_keys([1], [0.0]))[0] == 2
+    assert np.searchsorted(cover, site_year_keys([0], [2001.0]), side='right')[0] == 1
+    assert np.searchsorted(cover, site_year_keys([0], [20000.0]), side='right')[0] == 2
+
+
+def _brute_force_links(bleaching, recovery, max_km, window_years):
+    rows = []
+    for _, survey in bleaching.dropna(subset=['date_year', 'percent_bleaching']).iterrows():
+        distances = _haversine(survey['latitude_degrees'], survey['longitude_degrees'],
+                               recovery['latitude_degrees'], recovery['longitude_degrees'])
+        nearby = recovery[(distances <= max_km) & recovery['date_year'].between(
+            survey['date_year'], survey['date_year'] + window_years)]
+        for site_id, surveys in nearby.groupby('site_id'):
+            cover = surveys.groupby('date_year')['percent_hard_coral_cover'].mean().sort_index()
+            rows.append((survey['site_id'], survey['date_year'], site_id,
+                         cover.index[0], cover.iloc[0], cover.index[-1], cover.iloc[-1], len(cover)))
+    return sorted(rows)
+
+
+def test_links_match_brute_force_join():
+    rng = np.random.default_rng(1)
+    bleaching_coords = _coords(rng, 40)
+    bleaching = pd.DataFrame({
+        'site_id': np.arange(120) % 40,
+        'date_year': rng.integers(1995, 2015, 120).astype(float),
+        'percent_bleaching': rng.uniform(0, 100, 120),
+    })
+    bleaching = bleaching.join(bleaching_coords, on='site_id')
+    recovery_coords = _coords(rng, 30).set_axis(1000 + np.arange(30))
+    recovery = pd.DataFrame({
+        'site_id': 1000 + np.arange(400) % 30,
+        'date_year': rng.integers(1995, 2022, 400).astype(float),
+        'percent_hard_coral_cover': rng.uniform(0, 60, 400),
+    })
+    recovery = recovery.join(recovery_coords, on='site_id')
+    site_columns = ['site_id', 'latitude_degrees', 'longitude_degrees']
+
+    bleaching_sites, bleaching_obs = normalize_sites(bleaching, site_columns)
+    recovery_sites, recovery_obs = normalize_sites(recovery, site_columns)
+    links = link_bleaching_to_recovery(bleaching_sites, bleaching_obs, recovery_sites, recovery_obs, 50, 5)
+
+    found = sorted(zip(
+        bleaching_sites['site_id'].to_numpy()[links['bleaching_site']], links['bleaching_year'],
+        recovery_sites['site_id'].to_numpy()[links['recovery_site']], links['start_year'], links['start_cover'],
+        links['end_year'], links['end_cover'], links['surveys']))
+    expected = _brute_force_links(bleaching, recovery, 50, 5)
+    assert len(expected) > 20
+    assert len(found) == len(expected)
+    for row, brute in zip(found, expected):
+        np.testing.assert_allclose(row, brute, rtol=1e-12)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from utils.sites import normalize_sites
+from utils.thermal_stress import detect_thermal_anomalies, rolling_zscores, stress_events
+
+
+def test_rolling_zscores_match_brute_force_baselines():
+    rng = np.random.default_rng(0)
+    # Irregular survey years per group, so the baseline is a span of years rather than of rows
+    frame = pd.concat([
+        pd.DataFrame({'key': key, 'year': np.sort(rng.choice(np.arange(1980, 2021), 25, replace=False)).astype(float)})
+        for key in ['a', 'b', 'c']
+    ], ignore_index=True)
+    frame['value'] = rng.normal(0, 1, len(frame))
+    scores = rolling_zscores(frame.sample(frac=1, random_state=0), 'key', 'value', baseline_years=10, min_years=3)
+
+    for _, row in scores.iterrows():
+        group = frame[frame['key'] == row['key']]
+        baseline = group.loc[group['year'].between(row['year'] - 10, row['year'] - 1), 'value']
+        if len(baseline) < 3:
+            assert np.isnan(row['zscore'])
+            continue
+        assert np.isclose(row['baseline_mean'], baseline.mean(), rtol=0, atol=1e-12)
+        assert np.isclose(row['baseline_std'], baseline.std(), rtol=0, atol=1e-12)
+        assert np.isclose(row['zscore'], (row['value'] - baseline.mean()) / baseline.std(), rtol=0, atol=1e-9)
+
+
+def _surveys(metric='tsa_mean'):
+    years = np.arange(1990, 2011)
+    rows = []
+    for site_id, region in [(1, 'north'), (2, 'north'), (3, 'south')]:
+        for year in years:
+            # Steady stress alternating within +-0.1, never near two standard deviations, until the spike
+            value = 1.0 + (0.1 if year % 2 else -0.1)
+            if region == 'north' and year == 2005:
+                value += 2.0
+            rows.append((site_id, region, 'Australia', float(year), value))
+    df = pd.DataFrame(rows, columns=['site_id', 'region', 'country_name', 'date_year', metric])
+    return normalize_sites(df, ['site_id', 'region', 'country_name'])
+
+
+def test_spike_is_flagged_for_its_sites_and_region():
+    anomalies = detect_thermal_anomalies(*_surveys())
+    assert anomalies['metric'] == 'tsa_mean'
+    flagged = anomalies['site'][anomalies['site']['anomaly']]
+    assert set(flagged['year']) == {2005.0}
+    events = stress_events(anomalies['region'])
+    assert events[['start_year', 'end_year']].values.tolist() == [[2005, 2005]]
+    assert events['regions'].iloc[0] == ['north'] and events['site_share'].iloc[0] == 1.0
+
+
+def test_other_metrics_are_used_when_tsa_is_missing():
+    assert detect_thermal_anomalies(*_surveys('ssta_mean'))['metric'] == 'ssta_mean'
+
+
+def test_no_stress_metric_returns_none():
+    sites, observations = _surveys()
+    assert detect_thermal_anomalies(sites, observations.drop(columns='tsa_mean')) is None
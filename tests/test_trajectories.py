@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from utils.trajectories import compute_trajectories, site_year_cover
+
+
+def _surveys(*sites):
+    rows = [(site_id, year, cover) for site_id, series in sites for year, cover in series]
+    return pd.DataFrame(rows, columns=['site_id', 'date_year', 'percent_hard_coral_cover'])
+
+
+def test_site_year_cover_averages_repeat_surveys_in_order():
+    df = _surveys(('b', [(2001, 10.0), (2000, 30.0)]), ('a', [(2000, 20.0), (2000, 40.0)]))
+    cover = site_year_cover(df)
+    assert cover[['site', 'year']].values.tolist() == [[0, 2000], [0, 2001], [1, 2000]]
+    assert cover['cover'].tolist() == [30.0, 10.0, 30.0]
+
+
+def test_recovery_is_measured_until_the_baseline_is_regained():
+    df = _surveys(('a', [(2000, 50.0), (2002, 20.0), (2004, 35.0), (2006, 55.0), (2008, 60.0)]))
+    event = compute_trajectories(df).iloc[0]
+    assert (event['disturbance_year'], event['baseline_cover'], event['disturbed_cover']) == (2002, 50.0, 20.0)
+    assert event['recovered'] and event['recovery_year'] == 2006 and event['years_to_recover'] == 4
+    assert event['annual_recovery_rate'] == (55.0 - 20.0) / 4
+    assert event['relative_drop'] == 0.6
+
+
+def test_unrecovered_event_runs_to_the_last_survey():
+    df = _surveys(('a', [(2000, 40.0), (2001, 10.0), (2003, 16.0)]), ('b', [(2000, 40.0), (2001, 35.0)]))
+    events = compute_trajectories(df)
+    assert len(events) == 1
+    event = events.iloc[0]
+    assert not event['recovered'] and np.isnan(event['years_to_recover'])
+    assert (event['end_year'], event['end_cover']) == (2003, 16.0)
+    assert event['annual_recovery_rate'] == 3.0
+
+
+def test_a_second_disturbance_starts_a_new_event():
+    df = _surveys(('a', [(2000, 50.0), (2001, 20.0), (2003, 50.0), (2004, 10.0), (2006, 30.0)]))
+    events = compute_trajectories(df)
+    assert events['disturbance_year'].tolist() == [2001, 2004]
+    assert events['baseline_cover'].tolist() == [50.0, 50.0]
+    assert events['recovered'].tolist() == [True, False]
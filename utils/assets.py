@@ -0,0 +1,177 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+
+import streamlit as st
+
+from utils.fingerprint import file_hash
+
+STATIC_DIR = "static"
+ASSET_DIR = os.path.join(STATIC_DIR, "img")
+MANIFEST_PATH = os.path.join(ASSET_DIR, "manifest.json")
+STATIC_URL = "app/static/img"
+
+# Source images and the display widths (in CSS pixels, 2x variants included) they are resized to
+SOURCE_IMAGES = {
+    "utils/salmon-teal-coral-reef.png": (480, 960, 1440, 1920),
+    "utils/streamlit.png": (100, 200),
+    "utils/Q.jpeg": (100, 200),
+    "utils/git.png": (100, 200),
+    "utils/deepnote.png": (100, 200),
+    "utils/python.png": (100, 200),
+}
+
+# Modern formats, preferred by the browser in this order; the source format is always kept as fallback.
+# Streamlit's static file server only sends an image content type for .webp, so AVIF is opt-in for
+# deployments where a CDN or proxy serves the files.
+MODERN_FORMATS = ("webp",)
+FORMAT_OPTIONS = {
+    "avif": dict(format="AVIF", quality=55),
+    "webp": dict(format="WEBP", quality=80, method=6),
+    "png": dict(format="PNG", optimize=True),
+    "jpeg": dict(format="JPEG", quality=85, optimize=True, progressive=True),
+}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+
+
+def _fallback_format(image):
+    """Keep PNG for images with transparency, otherwise fall back to JPEG"""
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    return "png" if has_alpha else "jpeg"
+
+
+def _encode_variant(image, width, fmt):
+    """Resize an image to `width` and encode it, returning the encoded bytes"""
+    from io import BytesIO
+    from PIL import Image
+
+    if image.width > width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+    if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, **FORMAT_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def build_assets(formats=MODERN_FORMATS, force=False):
+    """Generate resized, recompressed variants of every source image and write the manifest"""
+    from PIL import Image
+
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    manifest = load_manifest() if not force else {}
+
+    for source, widths in SOURCE_IMAGES.items():
+        source_hash = file_hash(source)
+        entry = manifest.get(source)
+        if entry and entry["source_hash"] == source_hash and list(entry["variants"])[:-1] == list(formats):
+            continue
+
+        stem = os.path.splitext(os.path.basename(source))[0].replace(" ", "-").lower()
+        with Image.open(source) as image:
+            image.load()
+            fallback = _fallback_format(image)
+            variants = {}
+            for fmt in list(formats) + [fallback]:
+                variants[fmt] = []
+                for target_width in sorted({min(width, image.width) for width in widths}):
+                    data = _encode_variant(image, target_width, fmt)
+                    name = f"{stem}-{target_width}.{hashlib.sha256(data).hexdigest()[:12]}.{fmt}"
+                    with open(os.path.join(ASSET_DIR, name), "wb") as f:
+                        f.write(data)
+                    variants[fmt].append({"width": target_width, "file": name})
+            manifest[source] = {
+                "source_hash": source_hash,
+                "width": image.width,
+                "height": image.height,
+                "fallback": fallback,
+                "variants": variants,
+            }
+
+    # Drop variants that are no longer referenced by the manifest
+    referenced = {variant["file"] for entry in manifest.values() for files in entry["variants"].values() for variant in files}
+    for name in os.listdir(ASSET_DIR):
+        if name != os.path.basename(MANIFEST_PATH) and name not in referenced:
+            os.remove(os.path.join(ASSET_DIR, name))
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest():
+    """Load the asset manifest, or an empty one if the pipeline has not been run"""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def picture_html(source, width=None, alt="", url=STATIC_URL):
+    """Build a <picture> element for an image in the asset manifest, with its variants served from `url`
+
+    Returns None if the image has no variants.
+    """
+    entry = load_manifest().get(source)
+    if entry is None:
+        return None
+
+    def srcset(files):
+        return ", ".join(f"{url}/{variant['file']} {variant['width']}w" for variant in files)
+
+    # Let the browser pick the first supported format and the smallest width that fills the container
+    sizes = f"{width}px" if width else "100vw"
+    style = f"width:{width}px" if width else "width:100%"
+    fallback_files = entry["variants"][entry["fallback"]]
+    picture = [
+        f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset(files)}" sizes="{sizes}">'
+        for fmt, files in entry["variants"].items() if fmt != entry["fallback"]
+    ]
+    picture.append(
+        f'<img src="{url}/{fallback_files[-1]["file"]}" srcset="{srcset(fallback_files)}" sizes="{sizes}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" style="{style};height:auto" '
+        f'alt="{html.escape(alt)}" decoding="async">'
+    )
+    return f'<picture>{"".join(picture)}</picture>'
+
+
+def variant_files(source):
+    """File names under ASSET_DIR of every variant of an image in the asset manifest"""
+    entry = load_manifest().get(source, {"variants": {}})
+    return [variant["file"] for files in entry["variants"].values() for variant in files]
+
+
+@st.cache_data
+def _picture_html(source, width, alt):
+    return picture_html(source, width, alt)
+
+
+def render_image(source, width=None, alt=""):
+    """Render an image from the asset manifest, falling back to st.image if it has no variants"""
+    picture = _picture_html(source, width, alt)
+    if picture is None:
+        if width:
+            st.image(source, width=width)
+        else:
+            st.image(source, use_container_width=True)
+    else:
+        st.markdown(picture, unsafe_allow_html=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build resized and recompressed image variants.")
+    parser.add_argument("--avif", action="store_true", help="also emit AVIF variants (needs a host that serves image/avif)")
+    parser.add_argument("--force", action="store_true", help="rebuild every variant even if the source is unchanged")
+    args = parser.parse_args()
+
+    formats = ("avif",) + MODERN_FORMATS if args.avif else MODERN_FORMATS
+    manifest = build_assets(formats, force=args.force)
+    print(f"Wrote {sum(len(files) for entry in manifest.values() for files in entry['variants'].values())} variants to {ASSET_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+
+import pandas as pd
+
+from utils.column_store import BLEACHING_COLUMNS
+from utils.ingest import CHUNK_SIZE, STATS, aggregate_chunks, read_chunks
+from utils.partitions import load_partitions
+
+BLEACHING_KEYS = ['country_name', 'date_year', 'exposure']
+BLEACHING_METRICS = ['percent_bleaching', 'temperature_maximum', 'windspeed', 'turbidity']
+MANAGEMENT_KEYS = ['management_authority']
+MANAGEMENT_METRICS = ['percent_hard_coral_cover']
+UNREPORTED_AUTHORITIES = ['nd', 'Not Reported']
+HEATMAP_COLUMNS = ['latitude_degrees', 'longitude_degrees', 'date_year', 'country_name', 'percent_bleaching']
+
+# Select the engine with CORAL_DATAFRAME_BACKEND=polars; pandas stays the default
+DEFAULT_BACKEND = os.environ.get("CORAL_DATAFRAME_BACKEND", "pandas")
+
+
+def filter_managed_recovery(df):
+    """Keep recovery rows with a reported management authority and coral cover"""
+    return df[
+        (df['management_authority'].notnull()) &
+        (~df['management_authority'].isin(UNREPORTED_AUTHORITIES)) &
+        (df['percent_hard_coral_cover'].notnull())
+    ]
+
+
+def _prepare_bleaching_chunk(chunk):
+    chunk['date_year'] = pd.to_datetime(chunk['date']).dt.year
+    for col in BLEACHING_METRICS:
+        chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+    return chunk.dropna(subset=['percent_bleaching'])
+
+
+class PandasBackend:
+    """Eager pandas, streaming the CSVs in fixed-size chunks"""
+
+    name = "pandas"
+
+    def __init__(self, chunksize=CHUNK_SIZE):
+        self.chunksize = chunksize
+
+    def bleaching_aggregates(self, path):
+        """Partial aggregates of the bleaching metrics per (country, year, exposure)"""
+        chunks = read_chunks(path, usecols=['country_name', 'exposure', 'date'] + BLEACHING_METRICS, chunksize=self.chunksize)
+        return aggregate_chunks(chunks, BLEACHING_KEYS, BLEACHING_METRICS, _prepare_bleaching_chunk)
+
+    def management_aggregates(self, path):
+        """Partial aggregates of coral cover per reported management authority"""
+        chunks = read_chunks(path, usecols=MANAGEMENT_KEYS + MANAGEMENT_METRICS, chunksize=self.chunksize)
+        return aggregate_chunks(chunks, MANAGEMENT_KEYS, MANAGEMENT_METRICS, filter_managed_recovery)
+
+    def heatmap_rows(self, path, year_range):
+        """Located bleaching surveys with a bleaching value inside the year range"""
+        # Only the year buckets overlapping the range are read; rows come back already inside it
+        df = load_partitions(path, year_range=year_range, **BLEACHING_COLUMNS)
+        return df[
+            (df['latitude_degrees'].notnull()) &
+            (df['longitude_degrees'].notnull()) &
+            (df['country_name'].notnull()) &
+            (df['percent_bleaching'].notnull())
+        ][HEATMAP_COLUMNS].copy()
+
+
+class PolarsBackend:
+    """Polars lazy queries: projection and predicate pushdown into the CSV scan, multi-threaded streaming execution"""
+
+    name = "polars"
+
+    def __init__(self):
+        import polars
+        self.pl = polars
+
+    def _collect(self, query):
+        try:
+            return query.collect(engine="streaming")
+        except TypeError:
+            # Polars releases before the engine argument
+            return query.collect(streaming=True)
+
+    def _scan(self, path):
+        return self.pl.scan_csv(path, infer_schema_length=10000)
+
+    def _numeric(self, col):
+        return self.pl.col(col).cast(self.pl.Float64, strict=False)
+
+    def _to_aggregate(self, result, keys, metrics):
+        """Convert a Polars group-by result to the pandas partial aggregate layout used by utils.ingest"""
+        index = pd.MultiIndex.from_arrays(
+            [pd.Index(result[key].to_numpy()).where(result[key].is_not_null().to_numpy()) for key in keys],
+            names=keys
+        )
+        columns = {(metric, stat): result[f"{metric}_{stat}"].to_numpy() for metric in metrics for stat in STATS}
+        aggregate = pd.DataFrame(columns, index=index)
+        if len(keys) == 1:
+            aggregate.index = aggregate.index.get_level_values(0)
+        return aggregate.sort_index()
+
+    def _grouped_stats(self, query, keys, metrics):
+        pl = self.pl
+        aggs = []
+        for metric in metrics:
+            aggs += [
+                pl.col(metric).sum().alias(f"{metric}_sum"),
+                pl.col(metric).count().alias(f"{metric}_count"),
+                pl.col(metric).min().alias(f"{metric}_min"),
+                pl.col(metric).max().alias(f"{metric}_max"),
+            ]
+        return self._to_aggregate(self._collect(query.group_by(keys).agg(aggs)), keys, metrics)
+
+    def bleaching_aggregates(self, path):
+        pl = self.pl
+        query = (
+            self._scan(path)
+            .select(['country_name', 'exposure', 'date'] + BLEACHING_METRICS)
+            .with_columns(
+                [self._numeric(col) for col in BLEACHING_METRICS]
+                + [pl.col('date').cast(pl.Utf8).str.to_datetime(strict=False).dt.year().cast(pl.Float64).alias('date_year')]
+            )
+            .filter(pl.col('percent_bleaching').is_not_null())
+        )
+        return self._grouped_stats(query, BLEACHING_KEYS, BLEACHING_METRICS)
+
+    def management_aggregates(self, path):
+        pl = self.pl
+        query = (
+            self._scan(path)
+            .select(MANAGEMENT_KEYS + MANAGEMENT_METRICS)
+            .with_columns(self._numeric('percent_hard_coral_cover'))
+            .filter(
+                pl.col('management_authority').is_not_null()
+                & ~pl.col('management_authority').is_in(UNREPORTED_AUTHORITIES)
+                & pl.col('percent_hard_coral_cover').is_not_null()
+            )
+        )
+        return self._grouped_stats(query, MANAGEMENT_KEYS, MANAGEMENT_METRICS)
+
+    def heatmap_rows(self, path, year_range):
+        pl = self.pl
+        numeric = ['latitude_degrees', 'longitude_degrees', 'date_year', 'percent_bleaching']
+        result = self._collect(
+            self._scan(path)
+            .select(HEATMAP_COLUMNS)
+            .with_columns([self._numeric(col) for col in numeric])
+            .filter(
+                pl.col('date_year').is_between(year_range[0], year_range[1])
+                & pl.all_horizontal(pl.col(HEATMAP_COLUMNS).is_not_null())
+            )
+        )
+        # Hand the columns over as NumPy arrays
+        return pd.DataFrame({col: result[col].to_numpy() for col in HEATMAP_COLUMNS})
+
+
+BACKENDS = {
+    "pandas": PandasBackend,
+    "polars": PolarsBackend,
+}
+
+
+def get_backend(name=None):
+    """Return the dataframe backend called `name`, or the configured default"""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown dataframe backend {name!r}; choose one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+N_RESAMPLES = 1000
+CONFIDENCE = 0.95
+SEED = 42
+
+# Upper bound on resampled values held in memory at once (resamples x observations)
+MAX_BATCH_ELEMENTS = 4_000_000
+
+
+def grouped_bootstrap_ci(values, groups, n_resamples=N_RESAMPLES, confidence=CONFIDENCE, seed=SEED):
+    """Percentile bootstrap confidence intervals for the mean of `values` within each group
+
+    Every resample of every group is drawn from one index matrix per batch: each column belongs to a
+    group and draws uniformly from that group's slice of the sorted values, and per-group sums come from
+    np.add.reduceat. Returns mean, lower, upper and count per group.
+    """
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups, dtype=object)
+    keep = ~np.isnan(values) & pd.notna(groups)
+    codes, labels = pd.factorize(groups[keep], sort=True)
+    values = values[keep]
+
+    # Lay each group's values out contiguously
+    order = np.argsort(codes, kind='stable')
+    sorted_values = values[order]
+    counts = np.bincount(codes, minlength=len(labels))
+    if not len(labels):
+        # Nothing to resample, e.g. a year range without surveys
+        empty = np.empty(0)
+        return pd.DataFrame({'mean': empty, 'lower': empty, 'upper': empty, 'count': counts},
+                            index=pd.Index(labels, name='group'))
+    offsets = np.r_[0, np.cumsum(counts)[:-1]]
+    column_offsets = np.repeat(offsets, counts)
+    column_sizes = np.repeat(counts, counts)
+
+    rng = np.random.default_rng(seed)
+    batch = max(1, min(n_resamples, MAX_BATCH_ELEMENTS // max(len(values), 1)))
+    resampled_means = np.empty((n_resamples, len(labels)))
+    for start in range(0, n_resamples, batch):
+        size = min(batch, n_resamples - start)
+        index = column_offsets + (rng.random((size, len(values))) * column_sizes).astype(np.int64)
+        resampled_means[start:start + size] = np.add.reduceat(sorted_values[index], offsets, axis=1) / counts
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(resampled_means, [alpha, 1 - alpha], axis=0)
+    means = np.bincount(codes, weights=values, minlength=len(labels)) / counts
+    return pd.DataFrame({'mean': means, 'lower': lower, 'upper': upper, 'count': counts}, index=pd.Index(labels, name='group'))
+
+
+def error_bars(frame, mean_col='mean'):
+    """Plotly error bar arrays (plus, minus) from lower/upper confidence bounds"""
+    return dict(
+        type='data',
+        symmetric=False,
+        array=(frame['upper'] - frame[mean_col]).to_numpy(),
+        arrayminus=(frame[mean_col] - frame['lower']).to_numpy(),
+        color='#555555',
+        thickness=1.5
+    )
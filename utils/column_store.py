@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.fingerprint import cached_file_hash
+from utils.ingest import CHUNK_SIZE, read_chunks
+
+STORE_DIR = "data/.column_store"
+
+# Columns kept in each store: numeric columns as float64 arrays, string columns as dictionary codes
+BLEACHING_COLUMNS = dict(
+    numeric=['site_id', 'latitude_degrees', 'longitude_degrees', 'date_year', 'percent_bleaching',
+             'temperature_maximum', 'turbidity', 'windspeed'],
+    categorical=['country_name', 'exposure']
+)
+RECOVERY_COLUMNS = dict(
+    numeric=['site_id', 'latitude_degrees', 'longitude_degrees', 'date_year', 'depth', 'percent_hard_coral_cover',
+             'percent_macroalgal_cover', 'temperature_mean', 'ssta_mean', 'tsa_mean'],
+    categorical=['country_name', 'region', 'management_authority']
+)
+
+
+_build_locks = {}
+_build_locks_guard = threading.Lock()
+
+
+def _build_lock(target):
+    with _build_locks_guard:
+        return _build_locks.setdefault(os.path.abspath(target), threading.Lock())
+
+
+def publish_once(target, marker, write):
+    """Build a versioned directory once and publish it atomically; returns `target`
+
+    `write(staging)` fills a private staging directory and must write the `marker` file last. The directory
+    is renamed into place only when complete, so readers never see a partial build. Threads building the
+    same target wait on one lock; other processes build in their own staging directories and the first
+    rename wins. Older versions next to `target` are removed afterwards.
+    """
+    marker_path = os.path.join(target, marker)
+    with _build_lock(target):
+        if os.path.exists(marker_path):
+            return target
+
+        parent = os.path.dirname(target)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f"{os.path.basename(target)}.tmp-", dir=parent)
+        # mkdtemp creates the directory private to this user; published stores are readable like any other file
+        os.chmod(staging, 0o755)
+        try:
+            write(staging)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # A directory without its marker was left by an interrupted build and is never complete
+        if os.path.isdir(target) and not os.path.exists(marker_path):
+            shutil.rmtree(target, ignore_errors=True)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(marker_path):
+                raise
+            # Another process published the same version first
+            return target
+
+        # Old versions can go; processes still mapping them keep their pages until they unmap
+        for old in os.listdir(parent):
+            if old != os.path.basename(target) and ".tmp-" not in old:
+                shutil.rmtree(os.path.join(parent, old), ignore_errors=True)
+    return target
+
+
+def _finish_column(staging, col, file, dtype, rows, remap=None):
+    """Copy a raw column into a .npy file block by block, optionally mapping the values through `remap`"""
+    raw_path = os.path.join(staging, f"{col}.raw")
+    if rows:
+        source = np.memmap(raw_path, dtype=np.float64 if remap is None else np.int64, mode='r', shape=(rows,))
+        target = np.lib.format.open_memmap(os.path.join(staging, file), mode='w+', dtype=dtype, shape=(rows,))
+        for start in range(0, rows, CHUNK_SIZE):
+            block = source[start:start + CHUNK_SIZE]
+            target[start:start + CHUNK_SIZE] = block if remap is None else remap[block]
+        target.flush()
+        del source, target
+    else:
+        np.save(os.path.join(staging, file), np.empty(0, dtype=dtype))
+    os.remove(raw_path)
+
+
+def build_column_store(csv_path, numeric, categorical, store_dir=STORE_DIR, chunksize=CHUNK_SIZE):
+    """Write the selected columns of a CSV as .npy files, once per version of the file; returns the store path"""
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    # Versioned by the file contents and the selected columns, so changing either builds a fresh store
+    version = hashlib.sha256(f"{cached_file_hash(csv_path)}:{numeric}:{categorical}".encode()).hexdigest()[:16]
+    target = os.path.join(store_dir, name, version)
+
+    def write(staging):
+        header = pd.read_csv(csv_path, nrows=0).columns
+        numeric_cols = [col for col in numeric if col in header]
+        categorical_cols = [col for col in categorical if col in header]
+        columns = [col for col in header if col in numeric_cols or col in categorical_cols]
+
+        # One chunk in memory at a time: values are appended to raw files, strings coded against growing dictionaries
+        raw = {col: open(os.path.join(staging, f"{col}.raw"), "wb") for col in columns}
+        dictionaries = {col: {} for col in categorical_cols}
+        rows = 0
+        try:
+            for chunk in read_chunks(csv_path, usecols=columns, chunksize=chunksize):
+                rows += len(chunk)
+                for col in numeric_cols:
+                    raw[col].write(pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=np.float64).tobytes())
+                for col in categorical_cols:
+                    codes, uniques = pd.factorize(chunk[col])
+                    known = dictionaries[col]
+                    lookup = np.array([known.setdefault(value, len(known)) for value in uniques.astype(str)] + [-1],
+                                      dtype=np.int64)
+                    # Code -1 (missing) picks the trailing -1 of the lookup
+                    raw[col].write(lookup[codes].tobytes())
+        finally:
+            for f in raw.values():
+                f.close()
+
+        for col in numeric_cols:
+            _finish_column(staging, col, f"{col}.npy", np.float64, rows)
+        categories = {}
+        for col in categorical_cols:
+            # Codes are renumbered so the dictionary is sorted, as pd.Categorical would order it
+            categories[col] = sorted(dictionaries[col])
+            rank = np.empty(len(categories[col]) + 1, dtype=np.int64)
+            rank[[dictionaries[col][value] for value in categories[col]]] = np.arange(len(categories[col]))
+            rank[-1] = -1
+            dtype = next(t for t in (np.int8, np.int16, np.int32, np.int64) if len(categories[col]) < np.iinfo(t).max)
+            _finish_column(staging, col, f"{col}.codes.npy", dtype, rows, rank)
+        # meta.json marks the store complete, so it is written last
+        with open(os.path.join(staging, "meta.json"), "w") as f:
+            json.dump(dict(rows=rows, columns=columns, numeric=numeric_cols, categories=categories), f)
+
+    return publish_once(target, "meta.json", write)
+
+
+def open_column_store(path):
+    """Open a column store as a DataFrame whose columns are read-only views of memory-mapped files"""
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    columns = {}
+    for col in meta["columns"]:
+        if col in meta["categories"]:
+            codes = np.load(os.path.join(path, f"{col}.codes.npy"), mmap_mode='r')
+            columns[col] = pd.Categorical.from_codes(codes, categories=pd.Index(meta["categories"][col]), validate=False)
+        else:
+            columns[col] = np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r')
+    # copy=False keeps every column backed by the shared page cache instead of private memory
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_column_store(csv_path, numeric, categorical, store_dir=STORE_DIR):
+    """Build the column store for a CSV if needed and open it"""
+    return open_column_store(build_column_store(csv_path, numeric, categorical, store_dir))
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from utils.ingest import CHUNK_SIZE, read_chunks
+
+RECOVERY_FEATURES = ['latitude_degrees', 'longitude_degrees', 'depth', 'percent_hard_coral_cover',
+                     'percent_macroalgal_cover', 'temperature_mean', 'ssta_mean', 'tsa_mean']
+BLEACHING_FEATURES = ['latitude_degrees', 'longitude_degrees', 'date_year', 'percent_bleaching',
+                      'temperature_maximum', 'turbidity', 'windspeed']
+
+
+class CovarianceAccumulator:
+    """Single-pass, mergeable co-moments of a set of columns with pairwise handling of missing values
+
+    Every statistic is kept per column pair, over the rows where both columns are present: the pair
+    count, each column's mean and sum of squared deviations, and the co-moment. Chunks are folded in
+    and accumulators merged with Chan et al.'s parallel update, so the result does not depend on how
+    the rows were split.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        # mean[i, j] and m2[i, j] describe column i over the rows where columns i and j are both present
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    @classmethod
+    def from_frame(cls, df, columns):
+        """Moments of a single in-memory chunk"""
+        acc = cls(columns)
+        values = df.reindex(columns=acc.columns).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        weights = present.astype(float)
+
+        # Shift by the chunk mean first; the deviations are what the co-moments need and stay well conditioned
+        counts = weights.sum(axis=0)
+        shift = np.divide(np.where(present, values, 0).sum(axis=0), counts, out=np.zeros(len(counts)), where=counts > 0)
+        centered = np.where(present, values - shift, 0.0)
+
+        acc.n = weights.T @ weights
+        sums = centered.T @ weights
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pair_mean = np.where(acc.n > 0, sums / acc.n, 0.0)
+        acc.mean = np.where(acc.n > 0, shift[:, None] + pair_mean, 0.0)
+        acc.m2 = (centered ** 2).T @ weights - sums * pair_mean
+        acc.comoment = centered.T @ centered - sums * pair_mean.T
+        return acc
+
+    def update(self, df):
+        """Fold a chunk of rows into the accumulator"""
+        return self.merge(CovarianceAccumulator.from_frame(df, self.columns))
+
+    def merge(self, other):
+        """Combine with an accumulator built from a disjoint set of rows, in place"""
+        n = self.n + other.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(n > 0, other.n / n, 0.0)
+            spread = np.where(n > 0, self.n * other.n / n, 0.0)
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + delta ** 2 * spread
+        self.comoment = self.comoment + other.comoment + delta * delta.T * spread
+        self.n = n
+        return self
+
+    def covariance(self):
+        """Pairwise sample covariance matrix"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = np.where(self.n > 1, self.comoment / (self.n - 1), np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pairwise Pearson correlation matrix; NaN where a pair has fewer than two rows or no variance"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            denominator = np.sqrt(self.m2 * self.m2.T)
+            corr = np.where((self.n > 1) & (denominator > 0), self.comoment / denominator, np.nan)
+        corr = np.clip(corr, -1, 1)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def streaming_correlation(path, columns, chunksize=CHUNK_SIZE):
+    """Correlation matrix of `columns` in a CSV file, reading one chunk at a time"""
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [col for col in columns if col in header]
+    acc = CovarianceAccumulator(columns)
+    for chunk in read_chunks(path, usecols=columns, chunksize=chunksize):
+        acc.update(chunk)
+    return acc.correlation()
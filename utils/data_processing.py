@@ -3,57 +3,337 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import matplotlib.pyplot as plt
+from utils.backends import UNREPORTED_AUTHORITIES, filter_managed_recovery, get_backend
+from utils.bootstrap import error_bars, grouped_bootstrap_ci
+from utils.column_store import BLEACHING_COLUMNS, RECOVERY_COLUMNS, load_column_store
+from utils.correlation import BLEACHING_FEATURES, RECOVERY_FEATURES, streaming_correlation
+from utils.data_watcher import DataWatcher, dependency_map, versioned
+from utils.disk_cache import disk_cache
+from utils.ingest import rollup
+from utils.memory_cache import memory_cache
+from utils.partitions import load_partitions
+from utils.sites import BLEACHING_SITE_COLUMNS, RECOVERY_SITE_COLUMNS, normalize_sites, site_mask, site_values
+from utils.sketches import build_digests, merge_digests, quantile_table
+from utils.spatial_join import LINK_DISTANCE_KM, LINK_WINDOW_YEARS, link_bleaching_to_recovery
+from utils.thermal_stress import detect_thermal_anomalies, stress_events
+from utils.trajectories import compute_trajectories, depth_bands, site_attributes, summarize_recovery
+from utils.year_index import YearRangeIndex
 
-@st.cache_data
+BLEACHING_CSV = "data/coral_bleaching_cleaned.csv"
+RECOVERY_CSV = "data/coral_recovery_cleaned.csv"
+CLUSTERED_CSV = "data/clustered_data.csv"
+ELBOW_CSV = "data/elbow_results.csv"
+GBR_HISTORICAL_CSV = "data/gbr_historical.csv"
+GBR_FORECAST_CSV = "data/gbr_forecast.csv"
+
+# Management categories dictionary
+MANAGEMENT_CATEGORIES = {
+    'National Park Service': 'National Government Agencies',
+    'Federal or national ministry or agency': 'National Government Agencies',
+    'Ministry of Environment': 'National Government Agencies',
+    'Ministry of Agriculture': 'National Government Agencies',
+    'U.S. Fish and Wildlife Service': 'National Government Agencies',
+    'Department of Environment': 'National Government Agencies',
+    'Environmental Protection Agency': 'National Government Agencies',
+    'National Oceanic and Atmospheric Administration': 'National Government Agencies',
+    'AU-QLD_DES': 'State/Provincial Authorities',
+    'AU-WA_DBCA': 'State/Provincial Authorities',
+    'AU-NSW_OEH': 'State/Provincial Authorities',
+    'State Department of Conservation': 'State/Provincial Authorities',
+    'State Fish and Wildlife': 'State/Provincial Authorities',
+    'Mili Atoll Local Government': 'Local/Regional Management',
+    'Jaluit Atoll Local Government': 'Local/Regional Management',
+    'Rongelap Atoll Local Government': 'Local/Regional Management',
+    'LGU': 'Local/Regional Management',
+    'Village Chiefs': 'Traditional/Community Management',
+    'Qoliqoli Committee': 'Traditional/Community Management',
+    'Traditional Fisherman': 'Traditional/Community Management',
+    'Fish Wardens': 'Traditional/Community Management',
+    'Community': 'Traditional/Community Management',
+    'Protected Area Management Board': 'Protected Area Management',
+    'Marine Parks and Reserves Unit': 'Protected Area Management',
+    'National Parks Trust': 'Protected Area Management',
+    'Sabah Parks': 'Protected Area Management',
+    'Fisheries Department': 'Fisheries Management',
+    'Fisheries Division': 'Fisheries Management',
+    'Seychelles Fishing Authority': 'Fisheries Management',
+    'Ministry of Fisheries': 'Fisheries Management',
+    'Nature Seychelles': 'Conservation Organizations',
+    'Chumbe Island Coral Park': 'Conservation Organizations',
+    'Bahamas National Trust': 'Conservation Organizations',
+    'Bermuda Audubon Society': 'Conservation Organizations'
+}
+
+def assign_management_category(authority):
+    """Map a management authority name onto a management category"""
+    if pd.isna(authority):
+        return 'Unspecified'
+    if authority in MANAGEMENT_CATEGORIES:
+        return MANAGEMENT_CATEGORIES[authority]
+    if any(keyword in str(authority).lower() for keyword in ['ministry', 'national', 'federal']):
+        return 'National Government Agencies'
+    elif any(keyword in str(authority).lower() for keyword in ['park', 'protected area']):
+        return 'Protected Area Management'
+    elif any(keyword in str(authority).lower() for keyword in ['fish']):
+        return 'Fisheries Management'
+    elif any(keyword in str(authority).lower() for keyword in ['community', 'village', 'traditional']):
+        return 'Traditional/Community Management'
+    elif any(keyword in str(authority).lower() for keyword in ['conservation', 'nature']):
+        return 'Conservation Organizations'
+    else:
+        return 'Other'
+
+@memory_cache
+@disk_cache(BLEACHING_CSV)
 def load_bleaching_data():
-    return pd.read_csv("data/coral_bleaching_cleaned.csv", low_memory=False)
+    return pd.read_csv(BLEACHING_CSV, low_memory=False)
 
-@st.cache_data
+@memory_cache
+@disk_cache(RECOVERY_CSV)
 def load_recovery_data():
-    return pd.read_csv("data/coral_recovery_cleaned.csv", low_memory=False)
+    return pd.read_csv(RECOVERY_CSV, low_memory=False)
+
+# Memory-mapped column stores; cache_resource hands out the mapped frame itself rather than a pickled copy,
+# keyed on the CSV's content hash so a changed file is never answered from the old mapping
+@versioned(BLEACHING_CSV)
+@st.cache_resource(show_spinner=False)
+def load_bleaching_columns(file_versions):
+    """Load the numeric and dictionary-encoded bleaching columns from the shared column store"""
+    return load_column_store(BLEACHING_CSV, **BLEACHING_COLUMNS)
+
+@versioned(RECOVERY_CSV)
+@st.cache_resource(show_spinner=False)
+def load_recovery_columns(file_versions):
+    """Load the numeric and dictionary-encoded recovery columns from the shared column store"""
+    return load_column_store(RECOVERY_CSV, **RECOVERY_COLUMNS)
+
+# Site dimension table plus narrow observations keyed by integer site ID, shared like the column stores
+@versioned(BLEACHING_CSV)
+@st.cache_resource(show_spinner=False)
+def load_bleaching_sites(file_versions):
+    """Split the bleaching column store into (sites, observations)"""
+    return normalize_sites(load_bleaching_columns(), BLEACHING_SITE_COLUMNS)
 
-@st.cache_data
+@versioned(RECOVERY_CSV)
+@st.cache_resource(show_spinner=False)
+def load_recovery_sites(file_versions):
+    """Split the recovery column store into (sites, observations)"""
+    return normalize_sites(load_recovery_columns(), RECOVERY_SITE_COLUMNS)
+
+# Country / year-bucket partitions: the predicates are checked against the manifest and only matching partitions are read
+def load_bleaching_partitions(countries=None, year_range=None):
+    """Load the bleaching columns for the given countries and inclusive year range"""
+    return load_partitions(BLEACHING_CSV, countries=countries, year_range=year_range, **BLEACHING_COLUMNS)
+
+def load_recovery_partitions(countries=None, year_range=None):
+    """Load the recovery columns for the given countries and inclusive year range"""
+    return load_partitions(RECOVERY_CSV, countries=countries, year_range=year_range, **RECOVERY_COLUMNS)
+
+@memory_cache
+@disk_cache(CLUSTERED_CSV)
 def load_clustered_data():
-    return pd.read_csv("data/clustered_data.csv", low_memory=False)
+    return pd.read_csv(CLUSTERED_CSV, low_memory=False)
 
-@st.cache_data
+# Feature correlations computed in one streaming pass over each dataset, refreshed with the data
+@memory_cache
+@disk_cache(RECOVERY_CSV)
 def load_correlation_matrix():
-    return pd.read_csv("data/correlation_matrix.csv", index_col=0, low_memory=False)
+    """Pairwise correlation matrix of the recovery features"""
+    return streaming_correlation(RECOVERY_CSV, RECOVERY_FEATURES)
 
-@st.cache_data
+@memory_cache
+@disk_cache(BLEACHING_CSV)
+def load_bleaching_correlation_matrix():
+    """Pairwise correlation matrix of the bleaching features"""
+    return streaming_correlation(BLEACHING_CSV, BLEACHING_FEATURES)
+
+@memory_cache
+@disk_cache(ELBOW_CSV)
 def load_elbow_results():
-    return pd.read_csv("data/elbow_results.csv", low_memory=False)
+    return pd.read_csv(ELBOW_CSV, low_memory=False)
 
-@st.cache_data
+@memory_cache
+@disk_cache(GBR_HISTORICAL_CSV)
 def load_gbr_historical():
-    return pd.read_csv("data/gbr_historical.csv", low_memory=False)
+    return pd.read_csv(GBR_HISTORICAL_CSV, low_memory=False)
 
-@st.cache_data
+@memory_cache
+@disk_cache(GBR_FORECAST_CSV)
 def load_gbr_forecast():
-    return pd.read_csv("data/gbr_forecast.csv", low_memory=False)
+    return pd.read_csv(GBR_FORECAST_CSV, low_memory=False)
+
+# One watcher per process refreshes the loaders and figures that read a data file when its contents change
+@st.cache_resource
+def start_data_watcher():
+    """Start watching the data files declared by the cached functions in this module"""
+    return DataWatcher(dependency_map(sys.modules[__name__])).start()
+
+# Shared pool that loads data for the page while the script renders the narrative
+_background_pool = ThreadPoolExecutor(thread_name_prefix="background-load")
+BACKGROUND_STATE_KEY = "background_loading"
+
+def _run_in_session(func, ctx):
+    # Streamlit's cached functions expect a session on the calling thread; borrow the submitting one
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, ctx)
+    try:
+        return func()
+    finally:
+        add_script_run_ctx(thread, None)
+
+def start_background_loading():
+    """Start loading the bleaching and recovery data each chart needs, once per session; returns one future per chart
+
+    Each future warms the caches behind one chart: the finished figure for charts with fixed inputs, the data
+    for charts driven by widgets. The futures are kept in the session state, so widget reruns reuse them
+    instead of queueing the work again; a task that failed is submitted again on the next run.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    futures = st.session_state.setdefault(BACKGROUND_STATE_KEY, {})
+    tasks = {
+        'heatmap': create_bleaching_heatmap,
+        'dashboard': load_bleaching_year_index,
+        'scatter': load_bleaching_columns,
+        'management': create_management_analysis,
+        'distribution': load_bleaching_sketches,
+        'timeline': create_climate_timeline,
+        'recovery': load_recovery_trajectories,
+        'links': load_bleaching_recovery_links,
+        'gbr': create_gbr_forecast,
+    }
+    for name, func in tasks.items():
+        future = futures.get(name)
+        if future is None or (future.done() and future.exception() is not None):
+            futures[name] = _background_pool.submit(_run_in_session, func, ctx)
+    return futures
+
+# Aggregates computed by the configured dataframe backend (see utils/backends.py)
+@memory_cache
+@disk_cache(BLEACHING_CSV)
+def load_bleaching_aggregates(backend=None):
+    """Partial aggregates of the bleaching metrics per (country, year, exposure)"""
+    return get_backend(backend).bleaching_aggregates(BLEACHING_CSV)
+
+@memory_cache
+@disk_cache(BLEACHING_CSV)
+def load_bleaching_year_index():
+    """Prefix-sum indexes of the bleaching metrics per country, exposure and country/exposure over the years"""
+    aggregates = load_bleaching_aggregates()
+    return {
+        'country': YearRangeIndex.from_aggregate(aggregates, ['country_name']),
+        'exposure': YearRangeIndex.from_aggregate(aggregates, ['exposure']),
+        'country_exposure': YearRangeIndex.from_aggregate(aggregates, ['country_name', 'exposure'])
+    }
+
+# Bootstrap confidence intervals for the bar chart means
+@memory_cache
+@disk_cache(BLEACHING_CSV)
+def load_country_bleaching_ci(year_range=None):
+    """Bootstrap confidence intervals of mean bleaching per country"""
+    df = load_bleaching_columns() if year_range is None else load_bleaching_partitions(year_range=year_range)
+    subset = df[df['percent_bleaching'].notnull()]
+    return grouped_bootstrap_ci(subset['percent_bleaching'], subset['country_name'])
+
+@memory_cache
+@disk_cache(RECOVERY_CSV)
+def load_management_category_ci():
+    """Bootstrap confidence intervals of mean hard coral cover per management category"""
+    recovery_mgmt = filter_managed_recovery(load_recovery_columns())
+    # Mapping a categorical column maps each authority once
+    categories = recovery_mgmt['management_authority'].map(assign_management_category)
+    return grouped_bootstrap_ci(recovery_mgmt['percent_hard_coral_cover'], categories)
+
+# Quantile sketches: a compact mergeable distribution per group, merged up to any coarser grouping on demand
+@memory_cache
+@disk_cache(BLEACHING_CSV)
+def load_bleaching_sketches():
+    """t-digests of percent bleaching per (country, year)"""
+    df = load_bleaching_columns()
+    keys = {'country_name': df['country_name'], 'date_year': df['date_year'].astype('Int64')}
+    return build_digests(df['percent_bleaching'], keys)
+
+@memory_cache
+@disk_cache(RECOVERY_CSV)
+def load_coral_cover_sketches():
+    """t-digests of hard coral cover per (country, year, management category) at managed sites"""
+    recovery_mgmt = filter_managed_recovery(load_recovery_columns())
+    keys = {
+        'country_name': recovery_mgmt['country_name'],
+        'date_year': recovery_mgmt['date_year'].astype('Int64'),
+        'management_category': recovery_mgmt['management_authority'].map(assign_management_category),
+    }
+    return build_digests(recovery_mgmt['percent_hard_coral_cover'], keys)
+
+# Bleaching surveys linked to nearby recovery surveys in the following years
+@memory_cache
+@disk_cache(BLEACHING_CSV, RECOVERY_CSV)
+def load_bleaching_recovery_links(max_km=LINK_DISTANCE_KM, window_years=LINK_WINDOW_YEARS):
+    """Bleaching surveys joined to recovery sites within `max_km` and their cover change over `window_years`"""
+    bleaching_sites, bleaching = load_bleaching_sites()
+    recovery_sites, recovery = load_recovery_sites()
+    return link_bleaching_to_recovery(bleaching_sites, bleaching, recovery_sites, recovery, max_km, window_years)
+
+# Thermal-stress z-scores against each site's and region's own trailing baseline
+@memory_cache
+@disk_cache(RECOVERY_CSV)
+def load_thermal_anomalies():
+    """Thermal-stress anomaly scores per (site, year) and per (region, year)"""
+    sites, observations = load_recovery_sites()
+    return detect_thermal_anomalies(sites, observations)
+
+@memory_cache
+@disk_cache(RECOVERY_CSV)
+def load_country_thermal_anomalies(country):
+    """Thermal-stress anomaly scores for one country's sites, reading only that country's partitions"""
+    return detect_thermal_anomalies(*normalize_sites(load_recovery_partitions(countries=[country]), RECOVERY_SITE_COLUMNS))
+
+def get_bleaching_year_bounds():
+    """Return the first and last survey year covered by the bleaching dashboard"""
+    years = load_bleaching_year_index()['country'].years
+    return int(years[0]), int(years[-1])
+
+@memory_cache
+@disk_cache(RECOVERY_CSV)
+def load_management_aggregates(backend=None):
+    """Partial aggregates of coral cover per reported management authority"""
+    return get_backend(backend).management_aggregates(RECOVERY_CSV)
+
+
+
+@memory_cache
+@disk_cache(RECOVERY_CSV)
+def load_recovery_trajectories():
+    """Per-site disturbance and recovery events, tagged with management category, region and depth band"""
+    sites, observations = load_recovery_sites()
+    events = compute_trajectories(observations)
+
+    # Attributes that are fixed per site come straight from the site table
+    columns = ['management_authority', 'region', 'depth']
+    attributes = sites[[col for col in columns if col in sites.columns]].join(site_attributes(observations, columns))
+    if 'management_authority' in attributes:
+        authority = attributes['management_authority'].where(~attributes['management_authority'].isin(UNREPORTED_AUTHORITIES))
+        attributes['management_category'] = authority.map(assign_management_category)
+    if 'depth' in attributes:
+        attributes['depth_band'] = depth_bands(pd.to_numeric(attributes['depth'], errors='coerce'))
+    return events.join(attributes, on='site')
 
 
 
 # Visualization 1 - Coral Bleaching Over The Years
-def create_bleaching_heatmap():
+@disk_cache(BLEACHING_CSV)
+def create_bleaching_heatmap(year_range=(2000, 2019)):
     """Create coral bleaching intensity heatmap visualization"""
-    bleaching_df = load_bleaching_data()
-    bleaching_filtered = bleaching_df[
-        (bleaching_df['date_year'].notnull()) & 
-        (bleaching_df['date_year'] >= 2000) & 
-        (bleaching_df['date_year'] <= 2019) &
-        (bleaching_df['latitude_degrees'].notnull()) & 
-        (bleaching_df['longitude_degrees'].notnull()) & 
-        (bleaching_df['country_name'].notnull())
-    ].copy()
+    # Located surveys with a bleaching value in the year range
+    bleaching_filtered = get_backend().heatmap_rows(BLEACHING_CSV, year_range)
     
     bleaching_filtered['date_year'] = bleaching_filtered['date_year'].astype(int)
-    bleaching_filtered['country_name'] = bleaching_filtered['country_name'].replace('France', 'France (Overseas Territory)')
-    
-    # Make sure intensity column exists and clean
-    bleaching_filtered = bleaching_filtered[bleaching_filtered['percent_bleaching'].notnull()]
+    bleaching_filtered['country_name'] = bleaching_filtered['country_name'].astype(str).replace('France', 'France (Overseas Territory)')
     
     # Create custom hover text
     bleaching_filtered['hover_text'] = bleaching_filtered['country_name'] + ' (' + bleaching_filtered['date_year'].astype(str) + ')'
@@ -142,9 +422,12 @@ def create_kmeans_analysis():
     return fig
 
 # Visualization 3 - Coral Bleaching and Environmental Correlation
-def create_bleaching_dashboard():
+@disk_cache(BLEACHING_CSV)
+def create_bleaching_dashboard(year_range=None):
     """Create comprehensive coral bleaching analysis dashboard"""
-    df = load_bleaching_data()
+    aggregates = load_bleaching_aggregates()
+    year_index = load_bleaching_year_index()
+    start, end = year_range or (None, None)
     
     # Color scheme
     CHART_COLORS = {
@@ -157,15 +440,22 @@ def create_bleaching_dashboard():
         'grid': '#E8E8E8'
     }
     
-    # Clean data
-    df['date_year'] = pd.to_datetime(df['date']).dt.year
-    numeric_cols = ['percent_bleaching', 'temperature_maximum', 'windspeed', 'turbidity']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    df = df.dropna(subset=['percent_bleaching'])
+    # Roll the partial aggregates up to each yearly trend
+    by_country_year = rollup(aggregates, ['country_name', 'date_year'])
+    by_year = rollup(aggregates, ['date_year'])
+    if year_range is not None:
+        by_country_year = by_country_year[by_country_year['date_year'].between(start, end)]
+        by_year = by_year[by_year['date_year'].between(start, end)]
+    
+    # Year-range means for the bar charts come straight from the prefix sums
+    def range_means(index):
+        stats = index.range_stats('percent_bleaching', start, end)
+        return stats[stats['count'] > 0].rename(columns={'mean': 'percent_bleaching'}).reset_index()
+    
+    by_country_exposure = range_means(year_index['country_exposure'])
+    by_exposure = range_means(year_index['exposure'])
     
-    countries = sorted(df['country_name'].unique())
+    countries = sorted(year_index['country'].groups)
     
     fig = make_subplots(
         rows=3, cols=2,
@@ -189,18 +479,22 @@ def create_bleaching_dashboard():
         annotation['font'] = dict(color='black', size=20)
     
     # Top 15 countries
-    country_bleaching = (df.groupby('country_name')['percent_bleaching']
-                        .agg(['mean', 'count'])
-                        .reset_index()
+    country_bleaching = (range_means(year_index['country'])
+                        .rename(columns={'percent_bleaching': 'mean'})
                         .sort_values('mean', ascending=False))
     top_15_countries = set(country_bleaching[country_bleaching['count'] >= 100].head(15)['country_name'])
     
+    # Split each table by country once instead of scanning it again for every country
+    yearly_by_country = dict(tuple(by_country_year.groupby('country_name', sort=False, observed=True)))
+    exposure_by_country = dict(tuple(by_country_exposure.groupby('country_name', sort=False, observed=True)))
+    no_years, no_exposure = by_country_year.iloc[:0], by_country_exposure.iloc[:0]
+    
     # Create traces per country
     for country in countries:
-        country_data = df[df['country_name'] == country]
+        country_years = yearly_by_country.get(country, no_years)
         
         # Bleaching trends
-        yearly_bleaching = country_data.groupby('date_year')['percent_bleaching'].mean().reset_index()
+        yearly_bleaching = country_years
         fig.add_trace(go.Scatter(
             x=yearly_bleaching['date_year'], y=yearly_bleaching['percent_bleaching'],
             mode='lines+markers', name=country, line=dict(color=CHART_COLORS['default']),
@@ -209,7 +503,7 @@ def create_bleaching_dashboard():
         ), row=1, col=1)
         
         # Exposure distribution
-        exposure_data = country_data.groupby('exposure')['percent_bleaching'].mean().reset_index()
+        exposure_data = exposure_by_country.get(country, no_exposure)
         fig.add_trace(go.Bar(
             x=exposure_data['exposure'], y=exposure_data['percent_bleaching'],
             name=country, marker_color=CHART_COLORS['default'],
@@ -218,7 +512,7 @@ def create_bleaching_dashboard():
         ), row=1, col=2)
         
         # Temperature trends
-        temp_data = country_data.groupby('date_year')['temperature_maximum'].mean().reset_index()
+        temp_data = country_years
         fig.add_trace(go.Scatter(
             x=temp_data['date_year'], y=temp_data['temperature_maximum'],
             name=country, line=dict(color=CHART_COLORS['temperature']),
@@ -227,7 +521,7 @@ def create_bleaching_dashboard():
         ), row=2, col=2)
         
         # Turbidity trends
-        turb_data = country_data.groupby('date_year')['turbidity'].mean().reset_index()
+        turb_data = country_years
         fig.add_trace(go.Scatter(
             x=turb_data['date_year'], y=turb_data['turbidity'],
             name=country, line=dict(color=CHART_COLORS['turbidity']),
@@ -236,7 +530,7 @@ def create_bleaching_dashboard():
         ), row=3, col=1)
         
         # Wind speed trends
-        wind_data = country_data.groupby('date_year')['windspeed'].mean().reset_index()
+        wind_data = country_years
         fig.add_trace(go.Scatter(
             x=wind_data['date_year'], y=wind_data['windspeed'],
             name=country, line=dict(color=CHART_COLORS['windspeed']),
@@ -245,7 +539,7 @@ def create_bleaching_dashboard():
         ), row=3, col=2)
     
     # Add global traces
-    global_bleaching = df.groupby('date_year')['percent_bleaching'].mean().reset_index()
+    global_bleaching = by_year
     fig.add_trace(go.Scatter(
         x=global_bleaching['date_year'], y=global_bleaching['percent_bleaching'],
         mode='lines+markers', name='Global Average', line=dict(color=CHART_COLORS['default']),
@@ -253,7 +547,7 @@ def create_bleaching_dashboard():
         visible=True
     ), row=1, col=1)
     
-    global_exposure = df.groupby('exposure')['percent_bleaching'].mean().reset_index()
+    global_exposure = by_exposure.copy()
     global_exposure['exposure'] = global_exposure['exposure'].replace('Sometimes', 'Hybrid')
     fig.add_trace(go.Bar(
         x=global_exposure['exposure'], y=global_exposure['percent_bleaching'],
@@ -262,7 +556,7 @@ def create_bleaching_dashboard():
         visible=True
     ), row=1, col=2)
     
-    global_temp = df.groupby('date_year')['temperature_maximum'].mean().reset_index()
+    global_temp = by_year
     fig.add_trace(go.Scatter(
         x=global_temp['date_year'], y=global_temp['temperature_maximum'],
         name='Global Temperature', line=dict(color=CHART_COLORS['temperature']),
@@ -270,7 +564,7 @@ def create_bleaching_dashboard():
         visible=True
     ), row=2, col=2)
     
-    global_turb = df.groupby('date_year')['turbidity'].mean().reset_index()
+    global_turb = by_year
     fig.add_trace(go.Scatter(
         x=global_turb['date_year'], y=global_turb['turbidity'],
         name='Global Turbidity', line=dict(color=CHART_COLORS['turbidity']),
@@ -278,7 +572,7 @@ def create_bleaching_dashboard():
         visible=True
     ), row=3, col=1)
     
-    global_wind = df.groupby('date_year')['windspeed'].mean().reset_index()
+    global_wind = by_year
     fig.add_trace(go.Scatter(
         x=global_wind['date_year'], y=global_wind['windspeed'],
         name='Global Wind Speed', line=dict(color=CHART_COLORS['windspeed']),
@@ -288,10 +582,14 @@ def create_bleaching_dashboard():
     
     # Top 15 Countries Chart
     top_15 = country_bleaching[country_bleaching['count'] >= 100].head(15)
+    top_15 = top_15.join(load_country_bleaching_ci(year_range)[['lower', 'upper']], on='country_name')
     fig.add_trace(go.Bar(
         x=top_15['country_name'], y=top_15['mean'],
         name='Top 15 Countries', marker_color=[CHART_COLORS['top15_default']] * len(top_15),
-        hovertemplate='<b>%{x}</b><br>Average Bleaching: %{y:.2f}%<extra></extra>',
+        error_y=error_bars(top_15),
+        customdata=np.column_stack([top_15['lower'], top_15['upper'], top_15['count']]),
+        hovertemplate='<b>%{x}</b><br>Average Bleaching: %{y:.2f}%<br>95% CI: %{customdata[0]:.2f}–%{customdata[1]:.2f}%'
+                      '<br>Surveys: %{customdata[2]:,}<extra></extra>',
         visible=True
     ), row=2, col=1)
     
@@ -349,92 +647,34 @@ def create_bleaching_dashboard():
 
 
 # Visualization 4 - Management Authorities
+@disk_cache(RECOVERY_CSV)
 def create_management_analysis():
     """Create management authorities coral recovery analysis"""
-    recovery_df = load_recovery_data()
-    
-    # Management categories dictionary
-    management_categories = {
-        'National Park Service': 'National Government Agencies',
-        'Federal or national ministry or agency': 'National Government Agencies',
-        'Ministry of Environment': 'National Government Agencies',
-        'Ministry of Agriculture': 'National Government Agencies',
-        'U.S. Fish and Wildlife Service': 'National Government Agencies',
-        'Department of Environment': 'National Government Agencies',
-        'Environmental Protection Agency': 'National Government Agencies',
-        'National Oceanic and Atmospheric Administration': 'National Government Agencies',
-        'AU-QLD_DES': 'State/Provincial Authorities',
-        'AU-WA_DBCA': 'State/Provincial Authorities',
-        'AU-NSW_OEH': 'State/Provincial Authorities',
-        'State Department of Conservation': 'State/Provincial Authorities',
-        'State Fish and Wildlife': 'State/Provincial Authorities',
-        'Mili Atoll Local Government': 'Local/Regional Management',
-        'Jaluit Atoll Local Government': 'Local/Regional Management',
-        'Rongelap Atoll Local Government': 'Local/Regional Management',
-        'LGU': 'Local/Regional Management',
-        'Village Chiefs': 'Traditional/Community Management',
-        'Qoliqoli Committee': 'Traditional/Community Management',
-        'Traditional Fisherman': 'Traditional/Community Management',
-        'Fish Wardens': 'Traditional/Community Management',
-        'Community': 'Traditional/Community Management',
-        'Protected Area Management Board': 'Protected Area Management',
-        'Marine Parks and Reserves Unit': 'Protected Area Management',
-        'National Parks Trust': 'Protected Area Management',
-        'Sabah Parks': 'Protected Area Management',
-        'Fisheries Department': 'Fisheries Management',
-        'Fisheries Division': 'Fisheries Management',
-        'Seychelles Fishing Authority': 'Fisheries Management',
-        'Ministry of Fisheries': 'Fisheries Management',
-        'Nature Seychelles': 'Conservation Organizations',
-        'Chumbe Island Coral Park': 'Conservation Organizations',
-        'Bahamas National Trust': 'Conservation Organizations',
-        'Bermuda Audubon Society': 'Conservation Organizations'
-    }
+    authority_aggregates = load_management_aggregates()
     
-    def assign_category(authority):
-        if pd.isna(authority):
-            return 'Unspecified'
-        if authority in management_categories:
-            return management_categories[authority]
-        if any(keyword in str(authority).lower() for keyword in ['ministry', 'national', 'federal']):
-            return 'National Government Agencies'
-        elif any(keyword in str(authority).lower() for keyword in ['park', 'protected area']):
-            return 'Protected Area Management'
-        elif any(keyword in str(authority).lower() for keyword in ['fish']):
-            return 'Fisheries Management'
-        elif any(keyword in str(authority).lower() for keyword in ['community', 'village', 'traditional']):
-            return 'Traditional/Community Management'
-        elif any(keyword in str(authority).lower() for keyword in ['conservation', 'nature']):
-            return 'Conservation Organizations'
-        else:
-            return 'Other'
-    
-    # Filter and prepare data
-    recovery_mgmt = recovery_df[
-        (recovery_df['management_authority'].notnull()) &
-        (recovery_df['management_authority'] != 'nd') &
-        (recovery_df['management_authority'] != 'Not Reported') &
-        (recovery_df['percent_hard_coral_cover'].notnull())
-    ].copy()
-    
-    # Apply categorization
-    recovery_mgmt['management_category'] = recovery_mgmt['management_authority'].apply(assign_category)
+    # Apply categorization once per authority rather than once per row
+    categories = authority_aggregates.index.map(assign_management_category).rename('management_category')
+    authority_aggregates = authority_aggregates.set_axis(categories)
     
     # Calculate mean recovery by category
-    agg_by_category = recovery_mgmt.groupby('management_category')['percent_hard_coral_cover'].mean().reset_index()
+    agg_by_category = rollup(authority_aggregates, ['management_category'])
     agg_by_category = agg_by_category.sort_values('percent_hard_coral_cover', ascending=True)
+    agg_by_category = agg_by_category.join(load_management_category_ci()[['lower', 'upper']], on='management_category')
     
     fig = go.Figure(go.Bar(
         y=agg_by_category['management_category'],
         x=agg_by_category['percent_hard_coral_cover'],
         orientation='h',
+        error_x=error_bars(agg_by_category, mean_col='percent_hard_coral_cover'),
+        customdata=np.column_stack([agg_by_category['lower'], agg_by_category['upper'], agg_by_category['percent_hard_coral_cover_count']]),
         marker=dict(
             color=agg_by_category['percent_hard_coral_cover'],
             colorscale=[[0, '#E1F5FE'], [0.5, '#4FC3F7'], [1, '#01579B']],
             showscale=True,
             colorbar=dict(title="Mean Recovery %")
         ),
-        hovertemplate='<b>%{y}</b><br>Mean Recovery: %{x:.2f}%<extra></extra>'
+        hovertemplate='<b>%{y}</b><br>Mean Recovery: %{x:.2f}%<br>95% CI: %{customdata[0]:.2f}–%{customdata[1]:.2f}%'
+                      '<br>Surveys: %{customdata[2]:,}<extra></extra>'
     ))
     
     fig.update_layout(
@@ -454,6 +694,10 @@ def create_management_analysis():
     return fig
 
 # Visualization 5 - GBR Forecast Analysis
+GBR_COUNTRY = 'Australia'
+GBR_STRESS_SHARE = 0.2
+
+@disk_cache(GBR_HISTORICAL_CSV, GBR_FORECAST_CSV, RECOVERY_CSV)
 def create_gbr_forecast():
     """Create Great Barrier Reef forecast visualization"""
     hist_df = load_gbr_historical()
@@ -516,6 +760,23 @@ def create_gbr_forecast():
         hovertemplate='<b>Lower 95% CI:</b> %{y:.2f}%<extra></extra>'
     ))
     
+    # Shade the years in which many Australian survey sites saw anomalous thermal stress
+    # (none when the recovery data has no thermal-stress column)
+    anomalies = load_country_thermal_anomalies(GBR_COUNTRY)
+    stressed = pd.Series(dtype=float)
+    if anomalies is not None:
+        site_scores = anomalies['site'].dropna(subset=['zscore'])
+        stressed = site_scores.groupby('year')['anomaly'].mean()
+        stressed = stressed[stressed >= GBR_STRESS_SHARE]
+    for year in stressed.index:
+        fig.add_vrect(x0=year - 0.5, x1=year + 0.5, fillcolor='rgba(255, 69, 0, 0.15)', line_width=0, layer='below')
+    if len(stressed):
+        fig.add_trace(go.Scatter(
+            x=[None], y=[None], mode='markers',
+            marker=dict(symbol='square', size=14, color='rgba(255, 69, 0, 0.35)'),
+            name='Thermal Stress Anomaly', hoverinfo='skip'
+        ))
+    
     fig.update_layout(
         xaxis_title='Year',
         yaxis_title='Hard Coral Cover Percentage',
@@ -545,39 +806,72 @@ def create_gbr_forecast():
     return fig
 
 # Visualization 6 - Global Climate Events Timeline
+# Documented events, shown when the survey data has no detectable thermal-stress anomalies
+HISTORICAL_CLIMATE_EVENTS = [
+    {
+        "year": "2005",
+        "event": "Caribbean Heatwave Crisis",
+        "detail": "80% bleaching in some reefs",
+        "color": "#FFA500",
+        "position": -1
+    },
+    {
+        "year": "2010",
+        "event": "SE Asia & Indian Ocean Event",
+        "detail": "Moderate El Niño bleaching",
+        "color": "#FF4500",
+        "position": 1
+    },
+    {
+        "year": "2014–2017",
+        "event": "Longest Global Bleaching",
+        "detail": "Severe damage on Great Barrier Reef",
+        "color": "#FF0000",
+        "position": -1
+    },
+    {
+        "year": "2019–2020",
+        "event": "Pacific & GBR Crisis",
+        "detail": "High ocean heat stress",
+        "color": "#8B0000",
+        "position": 1
+    }
+]
+
+STRESS_EVENT_COLORS = ["#FFA500", "#FF4500", "#FF0000", "#8B0000"]
+
+def get_climate_events():
+    """Return the strongest thermal-stress events detected in the recovery surveys, in time order"""
+    anomalies = load_thermal_anomalies()
+    if anomalies is None:
+        return HISTORICAL_CLIMATE_EVENTS
+    detected = stress_events(anomalies['region'], max_events=len(STRESS_EVENT_COLORS))
+    if detected.empty:
+        return HISTORICAL_CLIMATE_EVENTS
+
+    # Stronger anomalies get darker colors
+    ranks = detected['peak_zscore'].rank(method='first').astype(int) - 1
+    scale = (len(STRESS_EVENT_COLORS) - 1) / max(len(detected) - 1, 1)
+    metric = FEATURE_LABELS.get(anomalies['metric'], anomalies['metric'])
+    events = []
+    for i, e in detected.iterrows():
+        start, end = int(e['start_year']), int(e['end_year'])
+        detail = f"{metric} {e['peak_zscore']:.1f}σ above baseline"
+        if e['site_share'] > 0:
+            detail += f", {e['site_share']:.0%} of sites"
+        events.append({
+            "year": str(start) if start == end else f"{start}–{end}",
+            "event": f"Thermal Stress: {', '.join(e['regions'])}",
+            "detail": detail,
+            "color": STRESS_EVENT_COLORS[round(ranks[i] * scale)],
+            "position": -1 if i % 2 == 0 else 1
+        })
+    return events
+
+@disk_cache(RECOVERY_CSV)
 def create_climate_timeline():
     """Create global climate events timeline visualization"""
-    # Define timeline events with improved formatting
-    events = [
-        {
-            "year": "2005",
-            "event": "Caribbean Heatwave Crisis",
-            "detail": "80% bleaching in some reefs",
-            "color": "#FFA500",
-            "position": -1
-        },
-        {
-            "year": "2010",
-            "event": "SE Asia & Indian Ocean Event",
-            "detail": "Moderate El Niño bleaching",
-            "color": "#FF4500",
-            "position": 1
-        },
-        {
-            "year": "2014–2017",
-            "event": "Longest Global Bleaching",
-            "detail": "Severe damage on Great Barrier Reef",
-            "color": "#FF0000",
-            "position": -1
-        },
-        {
-            "year": "2019–2020",
-            "event": "Pacific & GBR Crisis",
-            "detail": "High ocean heat stress",
-            "color": "#8B0000",
-            "position": 1
-        }
-    ]
+    events = get_climate_events()
 
     # Create figure
     fig = go.Figure()
@@ -724,4 +1018,362 @@ def create_protection_treemap():
     
     fig.update_traces(textfont_color='black', textfont_size=16)
     
-    return fig
\ No newline at end of file
+    return fig
+
+# Visualization 7 - Site-Level Bleaching Drivers
+SCATTER_POINT_BUDGET = 20000
+SCATTER_DENSITY_BINS = 120
+SCATTER_DRIVERS = {
+    'temperature_maximum': 'Temperature (K)',
+    'turbidity': 'Turbidity Level',
+    'windspeed': 'Wind Speed (m/s)'
+}
+
+def get_scatter_filter_options():
+    """Return the countries and year bounds available to the scatter explorer"""
+    df = load_bleaching_columns()
+    countries = sorted(df['country_name'].cat.categories)
+    return countries, int(np.nanmin(df['date_year'])), int(np.nanmax(df['date_year']))
+
+def decimate_points(x, y, budget, bins=SCATTER_DENSITY_BINS, seed=0):
+    """Return indices of at most `budget` points, stratified over a 2D grid so sparse regions and outliers survive"""
+    n = len(x)
+    if n <= budget:
+        return np.arange(n)
+
+    # Assign every point to a grid cell
+    x_edges = np.linspace(np.nanmin(x), np.nanmax(x), bins + 1)
+    y_edges = np.linspace(np.nanmin(y), np.nanmax(y), bins + 1)
+    x_bin = np.clip(np.searchsorted(x_edges, x, side='right') - 1, 0, bins - 1)
+    y_bin = np.clip(np.searchsorted(y_edges, y, side='right') - 1, 0, bins - 1)
+    cell = x_bin * bins + y_bin
+
+    # Random priority within each cell, then the rank of every point inside its cell
+    priority = np.random.default_rng(seed).random(n)
+    order = np.lexsort((priority, cell))
+    sorted_cells = cell[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    rank = np.arange(n) - np.repeat(starts, counts)
+
+    # Smallest per-cell cap whose total kept points reaches the budget
+    sorted_counts = np.sort(counts)
+    caps = np.arange(1, sorted_counts[-1] + 1)
+    below = np.searchsorted(sorted_counts, caps, side='right')
+    kept = np.r_[0, np.cumsum(sorted_counts)][below] + caps * (len(sorted_counts) - below)
+    cap = caps[min(np.searchsorted(kept, budget), len(caps) - 1)]
+
+    keep = order[rank < cap]
+    if len(keep) > budget:
+        keep = np.random.default_rng(seed).choice(keep, budget, replace=False)
+    return np.sort(keep)
+
+@disk_cache(BLEACHING_CSV)
+def create_bleaching_scatter_explorer(driver='temperature_maximum', countries=None, year_range=None,
+                                      point_budget=SCATTER_POINT_BUDGET):
+    """Create WebGL site-level scatter of bleaching against an environmental driver"""
+    sites, observations = load_bleaching_sites()
+    driver_label = SCATTER_DRIVERS[driver]
+
+    # Brush by country (tested once per site) and year; only the selected rows are copied out
+    country_names = site_values(sites, observations, 'country_name')
+    mask = observations[['date_year', 'percent_bleaching', driver]].notnull().all(axis=1).to_numpy()
+    mask &= country_names.notnull().to_numpy()
+    if countries:
+        mask &= site_mask(sites, observations, 'country_name', countries)
+    if year_range is not None:
+        mask &= observations['date_year'].between(year_range[0], year_range[1]).to_numpy()
+    subset = observations[mask]
+
+    x = subset[driver].to_numpy(dtype=float)
+    y = subset['percent_bleaching'].to_numpy(dtype=float)
+    years = subset['date_year'].to_numpy().astype(int)
+    country_names = country_names[mask].to_numpy()
+
+    fig = go.Figure()
+
+    if len(subset) > point_budget:
+        # Density shading: bin every record server-side so only the grid is sent to the browser
+        counts, x_edges, y_edges = np.histogram2d(x, y, bins=SCATTER_DENSITY_BINS)
+        fig.add_trace(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.log10(np.where(counts.T > 0, counts.T, np.nan)),
+            customdata=counts.T,
+            colorscale='YlOrRd',
+            colorbar=dict(title=dict(text="Surveys (log10)", font=dict(color='black', size=16))),
+            hovertemplate=f'{driver_label}: %{{x:.2f}}<br>Bleaching: %{{y:.1f}}%<br>Surveys: %{{customdata:.0f}}<extra></extra>',
+            hoverongaps=False
+        ))
+        keep = decimate_points(x, y, point_budget)
+        marker = dict(size=3, color='#2E5077', opacity=0.35)
+    else:
+        keep = np.arange(len(subset))
+        marker = dict(
+            size=5, color=years, colorscale='YlOrRd', opacity=0.7,
+            colorbar=dict(title=dict(text="Year", font=dict(color='black', size=16)))
+        )
+
+    fig.add_trace(go.Scattergl(
+        x=x[keep],
+        y=y[keep],
+        mode='markers',
+        marker=marker,
+        customdata=np.column_stack([country_names[keep], years[keep]]),
+        hovertemplate=f'<b>%{{customdata[0]}}</b> (%{{customdata[1]}})<br>{driver_label}: %{{x:.2f}}<br>Bleaching: %{{y:.1f}}%<extra></extra>',
+        showlegend=False
+    ))
+
+    fig.update_layout(
+        xaxis_title=driver_label,
+        yaxis_title='Percent Bleaching',
+        height=600,
+        plot_bgcolor='#F5FBFF',
+        paper_bgcolor='#F5FBFF',
+        font=dict(color='black'),
+        hoverlabel=dict(font_size=16),
+        annotations=[dict(
+            text=f"Showing {len(keep):,} of {len(subset):,} surveys",
+            xref='paper', yref='paper', x=1, y=1.05, showarrow=False,
+            font=dict(size=14, color='black')
+        )]
+    )
+
+    fig.update_xaxes(title_font=dict(size=16, color='black'), tickfont=dict(size=14, color='black'))
+    fig.update_yaxes(title_font=dict(size=16, color='black'), tickfont=dict(size=14, color='black'))
+
+    return fig
+
+
+# Visualization 8 - Recovery After Disturbance
+RECOVERY_GROUPINGS = {
+    'management_category': 'Management Category',
+    'region': 'Region',
+    'depth_band': 'Depth'
+}
+
+@disk_cache(RECOVERY_CSV)
+def create_recovery_rate_analysis(group_by='management_category'):
+    """Create annualized coral recovery rate comparison after disturbance events"""
+    events = load_recovery_trajectories()
+    summary = summarize_recovery(events, group_by)
+    summary = summary.sort_values('median_recovery_rate', ascending=True)
+
+    fig = go.Figure(go.Bar(
+        y=summary[group_by].astype(str),
+        x=summary['median_recovery_rate'],
+        orientation='h',
+        marker=dict(
+            color=summary['median_recovery_rate'],
+            colorscale=[[0, '#E1F5FE'], [0.5, '#4FC3F7'], [1, '#01579B']],
+            showscale=True,
+            colorbar=dict(title="Recovery (pts/yr)")
+        ),
+        customdata=np.column_stack([summary['events'], summary['share_recovered'] * 100, summary['median_years_to_recover']]),
+        hovertemplate='<b>%{y}</b><br>Median Recovery: %{x:.2f} pts/yr<br>Events: %{customdata[0]:,}'
+                      '<br>Recovered: %{customdata[1]:.0f}%<br>Median Years to Recover: %{customdata[2]:.1f}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        xaxis_title='Median Annual Recovery Rate (percentage points of hard coral cover)',
+        yaxis_title=RECOVERY_GROUPINGS[group_by],
+        height=600,
+        margin=dict(l=200),
+        plot_bgcolor='#F5FBFF',
+        paper_bgcolor='#F5FBFF',
+        font=dict(color='black'),
+        hoverlabel=dict(font_size=16)
+    )
+
+    fig.update_xaxes(title_font=dict(size=16, color='black'), tickfont=dict(size=14, color='black'))
+    fig.update_yaxes(title_font=dict(size=16, color='black'), tickfont=dict(size=14, color='black'))
+
+    return fig
+
+def get_recovery_groupings():
+    """Return the recovery groupings available in the recovery dataset"""
+    events = load_recovery_trajectories()
+    return [group for group in RECOVERY_GROUPINGS if group in events.columns]
+
+# Visualization 9 - Distribution of Bleaching and Coral Cover
+DISTRIBUTION_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+
+@disk_cache(BLEACHING_CSV, RECOVERY_CSV)
+def create_distribution_analysis(year_range=None):
+    """Create box-style distributions of bleaching per country and coral cover per management category"""
+    bleaching = load_bleaching_sketches()
+    if year_range is not None:
+        years = bleaching.index.get_level_values('date_year')
+        bleaching = bleaching[(years >= year_range[0]) & (years <= year_range[1])]
+    by_country = quantile_table(merge_digests(bleaching, 'country_name'), DISTRIBUTION_QUANTILES)
+    by_country = by_country[by_country['count'] >= 100].sort_values('p90', ascending=False).head(15)
+
+    by_category = quantile_table(merge_digests(load_coral_cover_sketches(), 'management_category'), DISTRIBUTION_QUANTILES)
+    by_category = by_category.sort_values('p50', ascending=False)
+
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Bleaching by Country (15 highest p90)', 'Hard Coral Cover by Management Category'),
+        horizontal_spacing=0.1
+    )
+
+    panels = [
+        (1, by_country, '#8B0000', 'Bleaching'),
+        (2, by_category, '#2E5077', 'Hard Coral Cover'),
+    ]
+    for col, table, color, label in panels:
+        names = table.index.astype(str)
+        # Whiskers span p5 to p95; the tail beyond them is summarised by the p99 marker
+        fig.add_trace(go.Box(
+            x=names, q1=table['p25'], median=table['p50'], q3=table['p75'],
+            lowerfence=table['p5'], upperfence=table['p95'],
+            name=label, marker_color=color, showlegend=False,
+            hoverinfo='x+y'
+        ), row=1, col=col)
+        fig.add_trace(go.Scatter(
+            x=names, y=table['p99'], mode='markers',
+            name='p99', marker=dict(symbol='diamond', size=9, color=color), showlegend=False,
+            customdata=np.column_stack([table['p50'], table['p90'], table['count']]),
+            hovertemplate='<b>%{x}</b><br>Median: %{customdata[0]:.1f}%<br>p90: %{customdata[1]:.1f}%'
+                          '<br>p99: %{y:.1f}%<br>Surveys: %{customdata[2]:,.0f}<extra></extra>'
+        ), row=1, col=col)
+
+    fig.update_layout(
+        height=650,
+        plot_bgcolor='#F5FBFF',
+        paper_bgcolor='#F5FBFF',
+        font=dict(color='black'),
+        hoverlabel=dict(font_size=16)
+    )
+    fig.update_yaxes(title_text='Bleaching (%)', row=1, col=1)
+    fig.update_yaxes(title_text='Hard Coral Cover (%)', row=1, col=2)
+    fig.update_xaxes(tickangle=-45, tickfont=dict(size=12, color='black'))
+    fig.update_yaxes(title_font=dict(size=16, color='black'), tickfont=dict(size=14, color='black'), gridcolor='#E8E8E8')
+
+    return fig
+
+# Visualization 10 - Bleaching Severity and Subsequent Recovery
+SEVERITY_BANDS = [0, 1, 10, 30, 60, np.inf]
+SEVERITY_LABELS = ['None (<1%)', 'Mild (1-10%)', 'Moderate (10-30%)', 'Severe (30-60%)', 'Mass (>60%)']
+LINK_DISTANCES = [10, 25, 50, 100]
+LINK_WINDOWS = [3, 5, 10]
+
+@disk_cache(BLEACHING_CSV, RECOVERY_CSV)
+def create_severity_recovery_analysis(max_km=LINK_DISTANCE_KM, window_years=LINK_WINDOW_YEARS):
+    """Create bleaching severity vs. subsequent coral recovery rate comparison"""
+    links = load_bleaching_recovery_links(max_km, window_years).dropna(subset=['annual_recovery_rate'])
+    links['severity'] = pd.cut(links['percent_bleaching'], SEVERITY_BANDS, labels=SEVERITY_LABELS, right=False)
+    rates = links.groupby('severity', observed=False)['annual_recovery_rate']
+    summary = pd.DataFrame({
+        'median': rates.median(),
+        'p25': rates.quantile(0.25),
+        'p75': rates.quantile(0.75),
+        'links': rates.size(),
+        'recovery_sites': links.groupby('severity', observed=False)['recovery_site'].nunique(),
+    }).reset_index()
+
+    fig = go.Figure(go.Bar(
+        x=summary['severity'].astype(str),
+        y=summary['median'],
+        marker=dict(
+            color=summary['median'],
+            colorscale=[[0, '#8B0000'], [0.5, '#F5F5DC'], [1, '#01579B']],
+            showscale=False
+        ),
+        error_y=dict(
+            type='data', symmetric=False,
+            array=summary['p75'] - summary['median'],
+            arrayminus=summary['median'] - summary['p25'],
+            color='black', thickness=1.5, width=6
+        ),
+        customdata=np.column_stack([summary['p25'], summary['p75'], summary['links'], summary['recovery_sites']]),
+        hovertemplate='<b>%{x}</b><br>Median Recovery: %{y:.2f} pts/yr<br>Middle Half: %{customdata[0]:.2f} to %{customdata[1]:.2f}'
+                      '<br>Links: %{customdata[2]:,}<br>Recovery Sites: %{customdata[3]:,}<extra></extra>'
+    ))
+
+    fig.add_hline(y=0, line_color='black', line_width=1)
+    fig.update_layout(
+        xaxis_title='Bleaching Severity',
+        yaxis_title='Annual Change in Hard Coral Cover Nearby (pts/yr)',
+        height=600,
+        plot_bgcolor='#F5FBFF',
+        paper_bgcolor='#F5FBFF',
+        font=dict(color='black'),
+        hoverlabel=dict(font_size=16)
+    )
+
+    fig.update_xaxes(title_font=dict(size=16, color='black'), tickfont=dict(size=14, color='black'))
+    fig.update_yaxes(title_font=dict(size=16, color='black'), tickfont=dict(size=14, color='black'), gridcolor='#E8E8E8')
+
+    return fig
+
+# Visualization 11 - Feature Correlations
+CORRELATION_DATASETS = {
+    'recovery': 'Coral Recovery Surveys',
+    'bleaching': 'Coral Bleaching Surveys',
+}
+FEATURE_LABELS = {
+    'latitude_degrees': 'Latitude',
+    'longitude_degrees': 'Longitude',
+    'date_year': 'Year',
+    'depth': 'Depth',
+    'percent_hard_coral_cover': 'Hard Coral Cover',
+    'percent_macroalgal_cover': 'Macroalgal Cover',
+    'percent_bleaching': 'Bleaching',
+    'temperature_mean': 'Mean Temperature',
+    'temperature_maximum': 'Max Temperature',
+    'ssta_mean': 'SST Anomaly',
+    'tsa_mean': 'Thermal Stress Anomaly',
+    'turbidity': 'Turbidity',
+    'windspeed': 'Wind Speed',
+}
+
+def _correlation_figure(corr):
+    """Heatmap of a pairwise feature correlation matrix"""
+    # Features without any variance (e.g. an empty column) have no correlations to show
+    corr = corr.dropna(how='all').dropna(axis=1, how='all')
+    labels = [FEATURE_LABELS.get(col, col) for col in corr.columns]
+
+    fig = go.Figure(go.Heatmap(
+        z=corr.to_numpy(),
+        x=labels,
+        y=labels,
+        zmin=-1, zmax=1,
+        colorscale='RdBu_r',
+        text=np.round(corr.to_numpy(), 2),
+        texttemplate='%{text}',
+        textfont=dict(size=13),
+        colorbar=dict(title='Correlation'),
+        hovertemplate='<b>%{y}</b> vs <b>%{x}</b><br>Correlation: %{z:.3f}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        height=650,
+        yaxis=dict(autorange='reversed'),
+        plot_bgcolor='#F5FBFF',
+        paper_bgcolor='#F5FBFF',
+        font=dict(color='black'),
+        hoverlabel=dict(font_size=16)
+    )
+
+    fig.update_xaxes(tickangle=-45, tickfont=dict(size=14, color='black'))
+    fig.update_yaxes(tickfont=dict(size=14, color='black'))
+
+    return fig
+
+# Each dataset's heatmap is cached on its own CSV, so a change to one file leaves the other's entries valid
+@disk_cache(RECOVERY_CSV)
+def create_recovery_correlation_heatmap():
+    """Create heatmap of pairwise feature correlations for the recovery surveys"""
+    return _correlation_figure(load_correlation_matrix())
+
+@disk_cache(BLEACHING_CSV)
+def create_bleaching_correlation_heatmap():
+    """Create heatmap of pairwise feature correlations for the bleaching surveys"""
+    return _correlation_figure(load_bleaching_correlation_matrix())
+
+def create_correlation_heatmap(dataset='recovery'):
+    """Create heatmap of pairwise feature correlations for the recovery or bleaching surveys"""
+    if dataset == 'recovery':
+        return create_recovery_correlation_heatmap()
+    return create_bleaching_correlation_heatmap()
@@ -0,0 +1,178 @@
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.fingerprint import cached_file_hash, file_versions
+
+POLL_INTERVAL = 2.0
+MAX_EVENTS = 50
+
+logger = logging.getLogger(__name__)
+
+
+def versioned(*data_files):
+    """Key an in-process cached function (e.g. st.cache_resource) on the contents of the data files it reads
+
+    Goes above the cache decorator. The wrapper passes the files' current content hashes as the first
+    argument, so a cached result can never be served for a newer version of a file. It also declares the
+    files for the data watcher and forwards the cache's `clear`.
+    """
+    def decorator(cached):
+        @functools.wraps(cached)
+        def wrapper(*args, **kwargs):
+            return cached(file_versions(data_files), *args, **kwargs)
+
+        wrapper.data_files = data_files
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorator
+
+
+def _declared(obj, attribute):
+    # Streamlit's cached functions keep the decorated function on __wrapped__
+    for candidate in (obj, getattr(obj, "__wrapped__", None)):
+        value = getattr(candidate, attribute, None)
+        if value:
+            return value
+    return None
+
+
+def _name(func):
+    return getattr(func, "__qualname__", repr(func))
+
+
+def dependency_map(*modules):
+    """Map each data file to the cached loaders and figure builders that declare it, in definition order"""
+    dependencies = {}
+    for module in modules:
+        for obj in vars(module).values():
+            if not callable(obj) or getattr(obj, "__module__", None) != module.__name__:
+                continue
+            for path in _declared(obj, "data_files") or ():
+                dependencies.setdefault(os.path.normpath(path), []).append(obj)
+    return dependencies
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DataWatcher:
+    """Poll data files and refresh only the cached functions that read a file whose contents changed
+
+    A file is hashed once its size and modification time have held still for one poll, so a copy in
+    progress is not picked up half-written. Touching a file without changing its contents does nothing.
+    """
+
+    def __init__(self, dependencies, interval=POLL_INTERVAL, rebuild=True):
+        self.dependencies = dependencies
+        self.interval = interval
+        self.rebuild = rebuild
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._signatures = {path: _signature(path) for path in dependencies}
+        self._hashes = {path: self._hash(path) for path in dependencies}
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="data-rebuild")
+
+    @staticmethod
+    def _hash(path):
+        try:
+            return cached_file_hash(path)
+        except OSError:
+            return None
+
+    def file_hashes(self):
+        """Return the content hash last recorded for each watched file"""
+        return dict(self._hashes)
+
+    def check(self):
+        """Poll every watched file once, invalidate the dependents of changed files and return their paths"""
+        changed = []
+        for path in self.dependencies:
+            signature = _signature(path)
+            if signature == self._signatures[path]:
+                self._pending.pop(path, None)
+                continue
+            if self._pending.get(path) != signature:
+                # Still being written; look again on the next poll
+                self._pending[path] = signature
+                continue
+            del self._pending[path]
+            self._signatures[path] = signature
+            digest = self._hash(path)
+            if digest != self._hashes[path]:
+                self._hashes[path] = digest
+                changed.append(path)
+        if changed:
+            self.invalidate(changed)
+        return changed
+
+    def invalidate(self, paths):
+        """Free the in-memory entries of every function reading `paths` and queue them to be rebuilt"""
+        stale = []
+        for path in paths:
+            for func in self.dependencies.get(os.path.normpath(path), ()):
+                if func not in stale:
+                    stale.append(func)
+        for func in stale:
+            # Every cache tier is keyed on the file hashes, so nothing stale can be served; clearing frees the
+            # memory held by entries for the old version before the rebuild fills the new one
+            clear = getattr(func, "clear", None)
+            if clear is not None:
+                clear()
+        self.events.append({
+            "time": time.time(),
+            "files": list(paths),
+            "invalidated": [_name(func) for func in stale],
+        })
+        logger.info("Data changed in %s; invalidated %s", ", ".join(paths), ", ".join(map(_name, stale)))
+        if self.rebuild:
+            return self._executor.submit(self._rebuild, stale)
+        return None
+
+    def _rebuild(self, functions):
+        # Loaders are defined before the figures built from them, so they are warmed first
+        for func in functions:
+            recent_calls = _declared(func, "recent_calls")
+            if not recent_calls:
+                continue
+            for args, kwargs in list(recent_calls.values()):
+                if self._stop.is_set():
+                    return
+                try:
+                    func(*args, **kwargs)
+                except Exception:
+                    logger.exception("Rebuilding %s failed", _name(func))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Data watcher poll failed")
+
+    def start(self):
+        """Start polling on a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and wait for a rebuild in progress to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,189 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+from utils.backends import DEFAULT_BACKEND
+from utils.fingerprint import cached_file_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, concurrent replicas may just compute an entry twice
+    fcntl = None
+
+CACHE_DIR = "data/.cache"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bump to drop every entry even though no source changed, e.g. after upgrading pandas or plotly
+CACHE_VERSION = 1
+
+# Version directories of a function that nothing has written to for this long are deleted; younger ones
+# are kept because a replica still running older code or data may be filling them
+STALE_AFTER_SECONDS = 24 * 60 * 60
+
+# Distinct argument sets remembered per function so a data watcher can rebuild what was actually requested
+RECENT_CALLS = 8
+
+_stats = defaultdict(Counter)
+_stats_lock = threading.Lock()
+
+
+def _record(func_name, event):
+    with _stats_lock:
+        _stats[func_name][event] += 1
+
+
+def cache_stats():
+    """Return hit and miss counts per cached function for this process"""
+    with _stats_lock:
+        return {name: dict(counts) for name, counts in _stats.items()}
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:24]
+
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(func):
+    try:
+        return _digest(inspect.getsource(func))
+    except (OSError, TypeError):
+        return ""
+
+
+@functools.lru_cache(maxsize=None)
+def package_hash(package_dir=PACKAGE_DIR):
+    """Hash of every module in the utils package, so changing a helper that cached functions call invalidates them"""
+    parts = []
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(package_dir, name), "rb") as f:
+                parts += [name, f.read()]
+    return _digest(*parts)
+
+
+def _read_entry(path):
+    try:
+        with open(path, "rb") as f:
+            return True, pickle.load(f)
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        # A truncated or incompatible entry is treated as a miss and overwritten
+        return False, None
+
+
+def _write_entry(path, value):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file, shared by every process on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.handle = open(self.path, "a")
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.handle is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+            self.handle.close()
+
+
+def entry_dir(func_name, data_files, cache_dir=CACHE_DIR):
+    """Directory holding a function's entries for the current code, dataframe backend and data file contents"""
+    file_hashes = [cached_file_hash(path) for path in data_files]
+    return os.path.join(cache_dir, func_name, _digest(CACHE_VERSION, package_hash(), DEFAULT_BACKEND, *file_hashes))
+
+
+def prune_versions(directory, max_age=STALE_AFTER_SECONDS):
+    """Delete the sibling version directories of `directory` that have not been written to for `max_age` seconds"""
+    parent = os.path.dirname(directory)
+    cutoff = time.time() - max_age
+    for name in os.listdir(parent):
+        path = os.path.join(parent, name)
+        if name == os.path.basename(directory):
+            continue
+        try:
+            stale = os.path.getmtime(path) < cutoff
+        except OSError:
+            continue
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def disk_cache(*data_files, cache_dir=CACHE_DIR):
+    """Persist a function's results on disk, keyed by its name, source, arguments and the hashes of `data_files`
+
+    Replicas on the same host (or sharing `cache_dir`) start warm from each other's entries. Changing one
+    data file only invalidates the functions that list it. Entries are also keyed by the sources of the whole
+    utils package and the configured dataframe backend, so a release that changes a helper, or a switch of
+    backend, never serves results computed the old way.
+    """
+    def decorator(func):
+        func_name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                directory = entry_dir(func_name, data_files, cache_dir)
+                key = _digest(_source_hash(func), pickle.dumps((args, sorted(kwargs.items()))))
+            except (OSError, pickle.PicklingError):
+                return func(*args, **kwargs)
+            path = os.path.join(directory, f"{key}.pkl")
+            with _stats_lock:
+                wrapper.recent_calls[key] = (args, kwargs)
+                wrapper.recent_calls.move_to_end(key)
+                while len(wrapper.recent_calls) > RECENT_CALLS:
+                    wrapper.recent_calls.popitem(last=False)
+
+            found, value = _read_entry(path)
+            if found:
+                _record(func_name, "hits")
+                return value
+
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError:
+                return func(*args, **kwargs)
+
+            # Only one process fills an entry; the others wait and then read it
+            with _FileLock(f"{path}.lock"):
+                found, value = _read_entry(path)
+                if found:
+                    _record(func_name, "hits")
+                    return value
+                _record(func_name, "misses")
+                value = func(*args, **kwargs)
+                try:
+                    _write_entry(path, value)
+                except OSError:
+                    pass
+
+            prune_versions(directory)
+            return value
+
+        wrapper.cache_dir = cache_dir
+        wrapper.data_files = data_files
+        wrapper.recent_calls = OrderedDict()
+        return wrapper
+
+    return decorator
@@ -0,0 +1,54 @@
+import hashlib
+import os
+
+DATA_DIR = "data"
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_files(data_dir=DATA_DIR):
+    """List the CSV files under the data directory in a stable order"""
+    return sorted(
+        os.path.join(data_dir, name)
+        for name in os.listdir(data_dir)
+        if name.endswith(".csv")
+    )
+
+
+def data_fingerprint(data_dir=DATA_DIR):
+    """Return a single hash covering the name and contents of every data file"""
+    digest = hashlib.sha256()
+    for path in data_files(data_dir):
+        digest.update(os.path.basename(path).encode())
+        digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+
+_hash_memo = {}
+
+
+def cached_file_hash(path):
+    """Return a file's content hash, re-reading it only when its size or modification time changes"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _hash_memo:
+        _hash_memo[key] = file_hash(path)
+    return _hash_memo[key]
+
+
+def file_versions(paths):
+    """Return the current content hash of each file in `paths`, with None for a missing file"""
+    versions = []
+    for path in paths:
+        try:
+            versions.append(cached_file_hash(path))
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
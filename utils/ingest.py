@@ -0,0 +1,56 @@
+import pandas as pd
+
+CHUNK_SIZE = 50_000
+STATS = ['sum', 'count', 'min', 'max']
+
+
+def read_chunks(path, usecols=None, chunksize=CHUNK_SIZE):
+    """Read a CSV file as an iterator of DataFrames of at most `chunksize` rows"""
+    return pd.read_csv(path, usecols=usecols, chunksize=chunksize, low_memory=False)
+
+
+def partial_aggregate(df, keys, metrics):
+    """Sum, count, min and max of each metric per key combination of a single chunk"""
+    return df.groupby(keys, dropna=False, sort=False)[metrics].agg(STATS)
+
+
+def merge_aggregates(left, right):
+    """Merge two partial aggregates computed over disjoint sets of rows"""
+    if left is None:
+        return right
+    combined = pd.concat([left, right])
+    funcs = {col: 'sum' if col[1] in ('sum', 'count') else col[1] for col in combined.columns}
+    levels = list(range(combined.index.nlevels))
+    return combined.groupby(level=levels, dropna=False, sort=False).agg(funcs)
+
+
+def aggregate_chunks(chunks, keys, metrics, prepare=None):
+    """Fold a stream of chunks into one partial aggregate, holding a single chunk in memory at a time"""
+    result = None
+    for chunk in chunks:
+        if prepare is not None:
+            chunk = prepare(chunk)
+        result = merge_aggregates(result, partial_aggregate(chunk, keys, metrics))
+    return result.sort_index()
+
+
+def rollup(aggregate, keys, metrics=None):
+    """Re-aggregate onto a coarser set of keys, returning mean, count, min and max per metric"""
+    metrics = metrics or list(dict.fromkeys(col[0] for col in aggregate.columns))
+
+    def combine(stat, func):
+        # Rows with a missing value in one of `keys` are dropped, as in a plain groupby
+        return aggregate.xs(stat, axis=1, level=1)[metrics].groupby(level=keys).agg(func)
+
+    total = combine('sum', 'sum')
+    count = combine('count', 'sum')
+    lowest = combine('min', 'min')
+    highest = combine('max', 'max')
+
+    result = {}
+    for metric in metrics:
+        result[metric] = total[metric] / count[metric].where(count[metric] > 0)
+        result[f'{metric}_count'] = count[metric]
+        result[f'{metric}_min'] = lowest[metric]
+        result[f'{metric}_max'] = highest[metric]
+    return pd.DataFrame(result).reset_index()
@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import resource
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import numpy as np
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+
+from utils.data_processing import SCATTER_DRIVERS
+from utils.disk_cache import cache_stats
+from utils.memory_cache import memory_stats
+
+APP_PATH = "app.py"
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _rss_bytes():
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        # Outside Linux only the peak is available (kilobytes on Linux/BSD, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+# Interactions a viewer makes after the first full render of the page
+def _change_driver(at, rng):
+    # The widget shows formatted labels, so set the underlying option value
+    at.selectbox[0].set_value(rng.choice(list(SCATTER_DRIVERS)))
+
+
+def _brush_countries(at, rng):
+    options = at.multiselect[0].options
+    at.multiselect[0].set_value(rng.sample(options, k=rng.randint(0, min(3, len(options)))))
+
+
+def _brush_years(at, rng):
+    slider = at.slider(key=rng.choice(["dashboard_years", "scatter_years", "distribution_years"]))
+    start = rng.randint(slider.min, slider.max)
+    slider.set_value((start, rng.randint(start, slider.max)))
+
+
+def _revisit(at, rng):
+    pass
+
+
+ACTIONS = {
+    "change_driver": _change_driver,
+    "brush_countries": _brush_countries,
+    "brush_years": _brush_years,
+    "revisit": _revisit,
+}
+
+
+@contextmanager
+def _shared_runtime():
+    """Keep a mock Runtime available while sessions overlap
+
+    AppTest installs a mock Runtime at the start of each run and clears it at the end, which would pull it
+    out from under any other session still running.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    original = Runtime.__dict__["instance"]
+    Runtime.instance = classmethod(lambda cls: cls._instance or runtime)
+    try:
+        yield
+    finally:
+        Runtime.instance = original
+
+
+class _Sampler(threading.Thread):
+    """Record process CPU utilisation and memory at a fixed interval"""
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        start = time.perf_counter()
+        last_wall, last_cpu = start, _cpu_seconds()
+        while not self.stopped.wait(self.interval):
+            wall, cpu = time.perf_counter(), _cpu_seconds()
+            self.samples.append(dict(
+                t=round(wall - start, 2),
+                cpu_percent=round(100 * (cpu - last_cpu) / (wall - last_wall), 1),
+                rss_mb=round(_rss_bytes() / 2**20, 1),
+            ))
+            last_wall, last_cpu = wall, cpu
+
+
+def _run_session(session_id, reruns, think_time, timeout, latencies, errors):
+    rng = random.Random(session_id)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def timed(action):
+        start = time.perf_counter()
+        at.run()
+        latencies[action].append(time.perf_counter() - start)
+        if at.exception:
+            errors.append(dict(session=session_id, action=action, error=str(at.exception[0].message)))
+
+    try:
+        timed("initial_load")
+        for _ in range(reruns):
+            time.sleep(rng.uniform(0, think_time))
+            action = rng.choice(list(ACTIONS))
+            ACTIONS[action](at, rng)
+            timed(action)
+    except Exception as exc:
+        # A failed session stops early but should not take the whole run down with it
+        errors.append(dict(session=session_id, action="session", error=repr(exc)))
+
+
+def _summarize(values):
+    values = np.asarray(values)
+    summary = {f"p{p}": round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    summary.update(count=len(values), mean=round(float(values.mean()), 3), max=round(float(values.max()), 3))
+    return summary
+
+
+def run_load_test(sessions=4, reruns=10, think_time=1.0, sample_interval=0.5, timeout=300):
+    """Drive `sessions` concurrent headless sessions of app.py and return a latency/resource report"""
+    latencies = defaultdict(list)
+    errors = []
+    sampler = _Sampler(sample_interval)
+    rss_before = _rss_bytes()
+
+    sampler.start()
+    started = time.perf_counter()
+    with _shared_runtime():
+        threads = [
+            threading.Thread(target=_run_session, args=(i, reruns, think_time, timeout, latencies, errors))
+            for i in range(sessions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+    sampler.stopped.set()
+    sampler.join()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    cpu = [sample["cpu_percent"] for sample in sampler.samples] or [0]
+    rss = [sample["rss_mb"] for sample in sampler.samples] or [round(_rss_bytes() / 2**20, 1)]
+
+    disk_cache = {}
+    for name, counts in cache_stats().items():
+        lookups = counts.get("hits", 0) + counts.get("misses", 0)
+        disk_cache[name] = dict(counts, hit_rate=round(counts.get("hits", 0) / lookups, 3) if lookups else None)
+
+    memory_cache = {}
+    for name, counts in memory_stats().items():
+        lookups = counts.get("hits", 0) + counts.get("misses", 0)
+        memory_cache[name] = dict(counts, hit_rate=round(counts.get("hits", 0) / lookups, 3) if lookups else None)
+
+    return dict(
+        config=dict(sessions=sessions, reruns_per_session=reruns, think_time=think_time),
+        elapsed_seconds=round(elapsed, 2),
+        reruns_per_second=round(len(all_latencies) / elapsed, 2),
+        latency_seconds=dict(all=_summarize(all_latencies), **{action: _summarize(values) for action, values in latencies.items()}),
+        cpu_percent=dict(mean=round(float(np.mean(cpu)), 1), max=max(cpu)),
+        rss_mb=dict(before=round(rss_before / 2**20, 1), peak=max(rss), end=rss[-1]),
+        disk_cache=disk_cache,
+        memory_cache=memory_cache,
+        errors=errors,
+        samples=sampler.samples,
+    )
+
+
+def _print_report(report):
+    config = report["config"]
+    print(f"{config['sessions']} sessions x {config['reruns_per_session']} reruns in {report['elapsed_seconds']}s "
+          f"({report['reruns_per_second']} reruns/s)")
+    print(f"{'action':<18}{'count':>7}" + "".join(f"{f'p{p}':>9}" for p in PERCENTILES) + f"{'max':>9}")
+    for action, summary in report["latency_seconds"].items():
+        print(f"{action:<18}{summary['count']:>7}" + "".join(f"{summary[f'p{p}']:>9.3f}" for p in PERCENTILES) + f"{summary['max']:>9.3f}")
+    print(f"CPU: mean {report['cpu_percent']['mean']}%, max {report['cpu_percent']['max']}%")
+    print(f"RSS: {report['rss_mb']['before']} MB before, {report['rss_mb']['peak']} MB peak")
+    for name, counts in report["disk_cache"].items():
+        print(f"cache {name.rsplit('.', 1)[-1]}: {counts.get('hits', 0)} hits, {counts.get('misses', 0)} misses")
+    for name, counts in report["memory_cache"].items():
+        print(f"memory {name.rsplit('.', 1)[-1]}: {counts.get('hits', 0)} hits, {counts.get('misses', 0)} misses, "
+              f"{counts.get('evictions', 0)} evictions, {counts.get('bytes', 0) / 2**20:.1f} MB held")
+    if report["errors"]:
+        print(f"{len(report['errors'])} reruns raised exceptions, first: {report['errors'][0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent headless sessions.")
+    parser.add_argument("--sessions", type=int, default=4, help="number of concurrent sessions (default: 4)")
+    parser.add_argument("--reruns", type=int, default=10, help="interactions per session after the first load (default: 10)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="max seconds a session waits between interactions")
+    parser.add_argument("--interval", type=float, default=0.5, help="CPU/memory sampling interval in seconds")
+    parser.add_argument("--report", help="write the full report, including samples, to this JSON file")
+    args = parser.parse_args()
+
+    report = run_load_test(args.sessions, args.reruns, args.think_time, args.interval)
+    _print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
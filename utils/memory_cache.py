@@ -0,0 +1,142 @@
+import functools
+import os
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+from utils.fingerprint import file_versions
+
+# Per-process budget for cached results, measured as their pickled size
+MEMORY_BUDGET_MB = float(os.environ.get("CORAL_CACHE_BUDGET_MB", 512))
+
+# "cost" keeps results that were slow to build per byte; "lru" evicts the least recently used
+EVICTION_POLICY = os.environ.get("CORAL_CACHE_POLICY", "cost")
+
+
+class _Entry:
+    __slots__ = ("payload", "size", "cost", "priority")
+
+    def __init__(self, payload, cost):
+        self.payload = payload
+        self.size = len(payload)
+        self.cost = cost
+        self.priority = 0.0
+
+
+class CacheManager:
+    """Hold pickled results of many functions under one byte budget, evicting by LRU or by rebuild cost per byte
+
+    Cost-aware eviction is GreedyDual-Size: an entry's priority is the clock plus its build seconds per MB,
+    it is refreshed on every hit, and the clock advances to the priority of each evicted entry so that
+    expensive entries which stop being used still age out.
+    """
+
+    def __init__(self, budget_bytes, policy=EVICTION_POLICY):
+        if policy not in ("lru", "cost"):
+            raise ValueError(f"Unknown eviction policy {policy!r}; expected 'lru' or 'cost'")
+        self.budget_bytes = budget_bytes
+        self.policy = policy
+        self.used_bytes = 0
+        self._entries = OrderedDict()
+        self._clock = 0.0
+        self._lock = threading.Lock()
+        self._stats = defaultdict(Counter)
+
+    def _touch(self, entry):
+        entry.priority = self._clock + entry.cost / max(entry.size / 2**20, 1e-3)
+
+    def get(self, key):
+        """Return (found, value), unpickling a fresh copy so callers can mutate it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats[key[0]]["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._touch(entry)
+            self._stats[key[0]]["hits"] += 1
+            payload = entry.payload
+        return True, pickle.loads(payload)
+
+    def put(self, key, value, cost):
+        """Store a result that took `cost` seconds to build, evicting others to stay within the budget"""
+        try:
+            entry = _Entry(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), cost)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        with self._lock:
+            if entry.size > self.budget_bytes:
+                self._stats[key[0]]["oversized"] += 1
+                return
+            self._discard(key)
+            while self.used_bytes + entry.size > self.budget_bytes:
+                self._evict()
+            self._touch(entry)
+            self._entries[key] = entry
+            self.used_bytes += entry.size
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.used_bytes -= entry.size
+
+    def _evict(self):
+        if self.policy == "lru":
+            key = next(iter(self._entries))
+        else:
+            key = min(self._entries, key=lambda k: self._entries[k].priority)
+            self._clock = self._entries[key].priority
+        self._discard(key)
+        self._stats[key[0]]["evictions"] += 1
+
+    def clear(self, func_name=None):
+        """Drop every entry, or only those of one function"""
+        with self._lock:
+            for key in [key for key in self._entries if func_name is None or key[0] == func_name]:
+                self._discard(key)
+
+    def stats(self):
+        """Return hits, misses, evictions, entries and bytes held per function"""
+        with self._lock:
+            report = {name: dict(counts) for name, counts in self._stats.items()}
+            for (func_name, _), entry in self._entries.items():
+                counts = report.setdefault(func_name, {})
+                counts["entries"] = counts.get("entries", 0) + 1
+                counts["bytes"] = counts.get("bytes", 0) + entry.size
+            return report
+
+
+manager = CacheManager(int(MEMORY_BUDGET_MB * 2**20))
+
+
+def memory_stats():
+    """Return the shared cache manager's per-function counters"""
+    return manager.stats()
+
+
+def memory_cache(func):
+    """Cache a function's results in memory under the process-wide budget, keyed by its arguments
+
+    When `func` declares `data_files` (as disk_cache does), the key also holds their current content hashes,
+    so a result never outlives the version of the files it was built from.
+    """
+    func_name = f"{func.__module__}.{func.__qualname__}"
+    data_files = getattr(func, "data_files", ())
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            key = (func_name, pickle.dumps((file_versions(data_files), args, sorted(kwargs.items()))))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return func(*args, **kwargs)
+        found, value = manager.get(key)
+        if found:
+            return value
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        manager.put(key, value, time.perf_counter() - start)
+        return value
+
+    wrapper.clear = functools.partial(manager.clear, func_name)
+    return wrapper
@@ -0,0 +1,224 @@
+from utils.data_processing import (
+    create_bleaching_dashboard,
+    create_bleaching_heatmap,
+    create_bleaching_scatter_explorer,
+    create_climate_timeline,
+    create_correlation_heatmap,
+    create_distribution_analysis,
+    create_gbr_forecast,
+    create_kmeans_analysis,
+    create_management_analysis,
+    create_protection_treemap,
+    create_recovery_rate_analysis,
+    create_severity_recovery_analysis,
+)
+
+HERO_IMAGE = "utils/salmon-teal-coral-reef.png"
+TOOL_LOGOS = ["utils/streamlit.png", "utils/Q.jpeg", "utils/git.png", "utils/deepnote.png", "utils/python.png"]
+
+# The story page in reading order, rendered by app.py and by utils.static_export.
+# Blocks: title, image, markdown, info, columns (side-by-side markdown), divider, logos and chart.
+# A chart has an asset key, heading, optional intro, spinner text, figure builder and caption; the app
+# supplies widget values for the builder's arguments, the static export uses the builder's defaults.
+PAGE = [
+    dict(kind="title", text="GUARDIANS OF THE SEA: CORAL REEFS"),
+    dict(kind="divider"),
+    dict(kind="image", source=HERO_IMAGE, alt="Coral reef"),
+
+    # Intro
+    dict(kind="markdown", text="""
+## From Bright to White: The Journey of Coral Bleaching
+
+Coral reefs are often called the rainforests of the ocean. Though they cover less than 1% of the seafloor, they support nearly a quarter of all marine life, providing shelter and breeding grounds for countless species.
+
+They act as natural barriers, protecting coastlines from storms and erosion, and they sustain fisheries and food security for millions of people worldwide. Reefs also fuel local economies through tourism, diving, and recreation, while inspiring scientific discovery and cultural heritage.
+
+In short, coral reefs are a foundation of marine biodiversity, coastal protection, and human well-being — making them one of Earth’s most valuable ecosystems.
+"""),
+    dict(kind="info", text="An estimated **25% of all marine life**, including over 4,000 species of fish, are dependent on coral reefs at some point in their life cycle. **- *U.S. Environmental Protection Agency***"),
+    dict(kind="markdown", text="""
+## The Bleaching Crisis
+
+Coral reefs around the world have been significantly affected by the rise of global temperatures, changes in the climate, and general pollution of the environment and our oceans—undergoing a transformation known as **coral bleaching**.
+
+Coral bleaching occurs when corals become stressed by changes in their environment, most commonly:
+-  **Elevated sea temperatures**
+-  **Increased UV radiation**
+-  **Poor water quality and pollution**
+
+During bleaching, corals become transparent—revealing their white skeletons. While bleached corals are still alive, they are significantly weakened and more vulnerable to starvation, disease, and even death.
+"""),
+    dict(kind="info", text=" **The Ripple Effect**: When reefs die, fish populations decline, marine food webs collapse, coastal communities lose tourism income, and natural storm protection weakens."),
+
+    # Viz 6
+    dict(kind="chart", key="climate_timeline", heading="Global Climate Events Timeline",
+         spinner="Loading climate timeline...", builder=create_climate_timeline, caption="""
+📊 **What it shows:** The strongest thermal-stress events found in the reef survey data — years in which a region's heat stress rose well above its own previous decade — highlighting periods of widespread bleaching and ecological stress.
+
+🔎 **Meaning:** Because each region is compared with its own history, these events stand out from normal year-to-year variation, connecting the data directly to the global climate events that have influenced coral reef health over time.
+"""),
+    dict(kind="divider"),
+
+    # Datasets
+    dict(kind="markdown", text="""
+## Dataset Introduction
+
+To understand the global coral crisis, we analyze two comprehensive datasets that capture both the **destruction** and **recovery** of coral reefs worldwide.
+"""),
+    dict(kind="columns", texts=["""
+### [Coral Bleaching Dataset](https://www.bco-dmo.org/dataset/773466)
+
+**Focus**: Bleaching events and environmental stressors
+
+This dataset tracks coral bleaching presence/absence across global reef sites, enabling comparative analyses and determination of geographical bleaching thresholds.
+
+**Key Variables**:
+- Site exposure and distance to land
+- Mean turbidity and cyclone frequency
+- Sea-surface temperature metrics
+- Bleaching severity indicators
+""", """
+### [Coral Recovery Dataset](https://www.bco-dmo.org/dataset/933334)
+
+**Focus**: Recovery patterns following disturbances
+
+The Heatwaves and Coral-Recovery Database (HeatCRD) - the most comprehensive reference on coral recovery following marine heatwaves and other disturbances.
+
+**Key Variables**:
+- Coral cover percentages over time
+- MPA descriptions and protection status
+- Temperature and thermal stress indicators
+- Recovery rates and timelines
+"""]),
+    dict(kind="info", text="📈 **Combined Power**: 29,205+ data records spanning 44 years from 12,266 sites across 83 countries"),
+    dict(kind="divider"),
+
+    # Viz 1
+    dict(kind="chart", key="bleaching_heatmap", heading="Coral Bleaching Over The Years",
+         spinner="Loading bleaching visualization...", builder=create_bleaching_heatmap, caption="""
+📊 **What it shows:**
+A timeline of bleaching events across global reef locations since 2000, highlighting peaks in mass bleaching years.
+
+🔎 **Meaning:**
+This visualization communicates the alarming trend — bleaching is no longer rare. It's happening more frequently and with greater intensity, linked to global temperature rise. This chart also highlights the geographic hotspots, such as the Caribbean, Great Barrier Reef, and Indo-Pacific. It underlines that bleaching is not an isolated issue — it's a global climate crisis.
+"""),
+    dict(kind="divider"),
+
+    # Viz 3
+    dict(kind="chart", key="bleaching_dashboard", heading="Coral Bleaching and Environmental Correlation",
+         spinner="Loading environmental correlation dashboard...", builder=create_bleaching_dashboard, caption="""
+📊 **What it shows:**
+Correlation of bleaching with exposure levels, sea temperature, turbidity, and windspeed
+
+🔎 **Meaning:**
+Temperature rise is the strongest driver, but local conditions like water clarity and wind patterns amplify vulnerability — proving the need for both global and local action.
+"""),
+    dict(kind="divider"),
+
+    # Viz 7
+    dict(kind="chart", key="site_scatter", heading="Site-Level Bleaching Drivers",
+         spinner="Loading site-level explorer...", builder=create_bleaching_scatter_explorer, caption="""
+📊 **What it shows:**
+Every individual bleaching survey plotted against sea temperature, turbidity or wind speed, filtered by country and year. Dense regions are shaded by survey count.
+
+🔎 **Meaning:**
+Yearly means hide the spread between surveys — here you can see the threshold where high temperatures turn into severe bleaching, and how widely reefs under the same conditions can differ.
+"""),
+    dict(kind="divider"),
+
+    # Viz 9
+    dict(kind="chart", key="bleaching_distribution", heading="The Tail of Mass Bleaching",
+         spinner="Loading bleaching distributions...", builder=create_distribution_analysis, caption="""
+📊 **What it shows:**
+The spread of bleaching in the 15 countries with the most severe surveys, and of hard coral cover under each type of management. Boxes span the middle half of surveys, whiskers run from the 5th to the 95th percentile and diamonds mark the 99th.
+
+🔎 **Meaning:**
+Most surveys find little bleaching, but a small share record mass-bleaching events far above the average — the tail, not the mean, is where reefs are lost.
+"""),
+    dict(kind="divider"),
+
+    dict(kind="markdown", text="""
+## From White to Bright: The Journey of Coral Recovery
+
+Coral reef recovery after bleaching is essential to restore ecosystem health and stability. Recovery allows corals to regain their symbiotic algae, rebuild structures, and strengthen resilience to rising temperatures. It also supports effective restoration efforts, ensuring reefs can sustain marine life and recover their vital ecological functions.
+"""),
+    dict(kind="divider"),
+
+    # Viz 2
+    dict(kind="chart", key="kmeans_analysis", heading="Factors Driving Coral Recovery",
+         spinner="Loading K-means analysis...", builder=create_kmeans_analysis, caption="""
+📊 **What it shows:**
+Four key factors driving coral recovery: geographic location, temperature patterns, macroalgal competition, and depth
+
+🔎 **Meaning:**
+Geographic location dominates recovery patterns, explaining why some reefs are more resilient. Depth offers refuge in deeper waters, while algal competition threatens weakened corals post-bleaching. These insights guide targeted conservation — protecting deeper areas, controlling algal growth, and maintaining water quality can significantly improve recovery success for the 25% of marine life dependent on reefs.
+"""),
+    dict(kind="divider"),
+
+    # Viz 11
+    dict(kind="chart", key="feature_correlations", heading="How Reef Conditions Move Together",
+         spinner="Loading feature correlations...", builder=create_correlation_heatmap, caption="""
+📊 **What it shows:** The correlation between every pair of survey measurements, from -1 (move in opposite directions) to +1 (move together). Each pair uses every survey where both values were recorded.
+
+🔎 **Meaning:** Hard coral and macroalgae compete for the same space, while location and depth shape both — no single measurement explains recovery on its own, which is why the K-means analysis above combines them.
+"""),
+    dict(kind="divider"),
+
+    # Viz 4
+    dict(kind="chart", key="management_analysis", heading="Management Authority Effectiveness",
+         spinner="Loading management analysis...", builder=create_management_analysis, caption="""
+📊 **What it shows:** Recovery rates across different management approaches, with local/regional authorities achieving highest success (40%) and fisheries management close behind (35-40%).
+
+🔎 **Meaning:** Localized management outperforms broad strategies because it addresses specific reef needs—controlling macroalgae, managing local stressors, and empowering communities. While global climate action remains crucial, these findings suggest that successful coral conservation depends on tailored, community-driven approaches that complement geographic and environmental factors.
+"""),
+    dict(kind="divider"),
+
+    # Viz 8
+    dict(kind="chart", key="recovery_rates", heading="Recovery After Disturbance",
+         spinner="Loading recovery trajectories...", builder=create_recovery_rate_analysis, caption="""
+📊 **What it shows:** How fast reefs regrow after a disturbance — a survey where a site lost at least 30% of its hard coral cover — measured as percentage points of cover regained per year until the site is back to its pre-disturbance level.
+
+🔎 **Meaning:** Mean coral cover hides the time dimension. Following each site through its own drop and rebound shows which management approaches, regions and depths actually bounce back, and how long that takes.
+"""),
+    dict(kind="divider"),
+
+    # Viz 10
+    dict(kind="chart", key="severity_recovery", heading="After the Bleaching",
+         spinner="Linking bleaching to recovery surveys...", builder=create_severity_recovery_analysis, caption="""
+📊 **What it shows:** Every bleaching survey linked to the recovery surveys taken nearby in the years that followed, grouped by how severe the bleaching was. Bars show the median yearly change in hard coral cover at the linked sites; whiskers span the middle half.
+
+🔎 **Meaning:** The two datasets were collected separately. Joining them in space and time shows whether reefs near heavily bleached sites regrow more slowly — or keep losing coral — compared with reefs that were spared.
+"""),
+    dict(kind="divider"),
+
+    # Viz 5
+    dict(kind="chart", key="gbr_forecast", heading="Great Barrier Reef Forecast", intro="""
+The Great Barrier Reef, the world's largest reef system, has faced severe bleaching events. We forecasted recovery across the reef, highlighting areas with potential for rebound and the importance of targeted conservation and climate action.
+""", spinner="Loading GBR forecast...", builder=create_gbr_forecast, caption="""
+📊 **What it shows:** Historical coral cover (1992-2020) peaked at 35% in the late 1990s, declined to 20-25% after 2010, with projections showing further decline to 15% by 2030.
+
+Shaded years are those in which many Australian survey sites recorded anomalous thermal stress.
+
+🔎 **Meaning:** The widening confidence interval reflects increasing uncertainty as cumulative bleaching events reduce recovery windows. While the downward trend appears inevitable under current climate trajectories, varying management success rates suggest targeted interventions could moderate this decline, making every conservation effort critical for the reef's survival.
+"""),
+    dict(kind="divider"),
+
+    # Conclusion
+    dict(kind="chart", key="protection_treemap", heading="Conclusion", intro="""
+As we analyze the patterns of recovery and decline in places like the Great Barrier Reef, we learn so much about the resilience of nature and our role in protecting it. While reefs have shown the ability to recover in the past, the combination of rising temperatures, pollution in the oceans, and more frequent extreme weather events is testing their ability to survive. Analyzing this data isn't just about documenting decline, it's about finding ways to protect and preserve these ecosystems for future generations.
+""", spinner="Loading protection strategies...", builder=create_protection_treemap, caption="""
+📊 **What it shows:** Interactive treemap of coral reef protection strategies organized into global and local actions.
+
+🔎 **Meaning:** Effective coral protection requires coordinated action at multiple levels - from global climate initiatives to local community management, with each strategy playing a vital role in reef conservation.
+"""),
+    dict(kind="markdown", text="### A reef without color is a warning, not an ending!"),
+    dict(kind="divider"),
+
+    dict(kind="markdown", text="## Tools and Tech Used"),
+    dict(kind="logos", sources=TOOL_LOGOS, width=100),
+]
+
+
+def charts():
+    """The chart blocks of the page, in reading order"""
+    return [block for block in PAGE if block["kind"] == "chart"]
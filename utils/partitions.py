@@ -0,0 +1,142 @@
+import json
+import os
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from utils.column_store import STORE_DIR, build_column_store, open_column_store, publish_once
+
+PARTITION_DIR = "data/.partitions"
+# Survey years are grouped into buckets of this many years within each country
+YEAR_BUCKET = 5
+PARTITION_COUNTRY = 'country_name'
+PARTITION_YEAR = 'date_year'
+ROW_ID = "_row_id"
+
+
+def _partition_path(country, bucket):
+    country_dir = "country=__null__" if country is None else f"country={quote(country, safe='')}"
+    years_dir = "years=__null__" if bucket is None else f"years={bucket}-{bucket + YEAR_BUCKET - 1}"
+    return os.path.join(country_dir, years_dir)
+
+
+def build_partitions(csv_path, numeric, categorical, partition_dir=PARTITION_DIR, store_dir=STORE_DIR):
+    """Split a CSV's column store into one directory per (country, year bucket) plus a manifest; returns its path
+
+    Each partition holds the same .npy columns as the column store, with string columns still coded against
+    the store's shared dictionaries so partitions concatenate without re-encoding. The manifest records the
+    rows and the actual year span of every partition for pruning.
+    """
+    store = build_column_store(csv_path, numeric, categorical, store_dir)
+    name = os.path.basename(os.path.dirname(store))
+    # Same version as the column store it is cut from, plus the bucket width
+    target = os.path.join(partition_dir, name, f"{os.path.basename(store)}-{YEAR_BUCKET}y")
+
+    def write(staging):
+        with open(os.path.join(store, "meta.json")) as f:
+            meta = json.load(f)
+        df = open_column_store(store)
+        rows = len(df)
+        countries = df[PARTITION_COUNTRY].cat.codes.to_numpy() if PARTITION_COUNTRY in df else np.full(rows, -1)
+        years = df[PARTITION_YEAR].to_numpy() if PARTITION_YEAR in df else np.full(rows, np.nan)
+        buckets = np.where(np.isnan(years), -1, np.floor(np.nan_to_num(years) / YEAR_BUCKET) * YEAR_BUCKET).astype(np.int64)
+
+        # One stable sort groups the rows by partition while keeping file order inside each partition
+        order = np.lexsort((buckets, countries))
+        keys = np.column_stack([countries[order], buckets[order]])
+        starts = np.flatnonzero(np.r_[True, (np.diff(keys, axis=0) != 0).any(axis=1)])
+        ends = np.r_[starts[1:], rows]
+
+        paths, partitions = [], []
+        for start, end in zip(starts, ends):
+            code, bucket = keys[start]
+            country = meta["categories"][PARTITION_COUNTRY][code] if code >= 0 else None
+            bucket = int(bucket) if bucket >= 0 else None
+            paths.append(os.path.join(staging, _partition_path(country, bucket)))
+            os.makedirs(paths[-1])
+            span = years[order[start:end]]
+            known = bool(np.isfinite(span).any())
+            partitions.append(dict(
+                path=_partition_path(country, bucket), country=country, bucket=bucket, rows=int(end - start),
+                year_min=float(np.nanmin(span)) if known else None,
+                year_max=float(np.nanmax(span)) if known else None,
+            ))
+
+        def write_column(file, values):
+            for path, start, end in zip(paths, starts, ends):
+                np.save(os.path.join(path, file), values[start:end])
+
+        # Reorder one column at a time and write its slice into every partition, so only a single
+        # reordered column is held in memory next to the memmapped store
+        write_column(f"{ROW_ID}.npy", order.astype(np.int64))
+        for col in meta["columns"]:
+            if col in meta["categories"]:
+                write_column(f"{col}.codes.npy", df[col].cat.codes.to_numpy()[order])
+            else:
+                write_column(f"{col}.npy", df[col].to_numpy()[order])
+        manifest = dict(rows=rows, columns=meta["columns"], categories=meta["categories"],
+                        year_bucket=YEAR_BUCKET, partitions=partitions)
+        # The manifest marks the layout complete, so it is written last
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+
+    return publish_once(target, "manifest.json", write)
+
+
+def read_manifest(path):
+    """Load the partition manifest of a partitioned dataset"""
+    with open(os.path.join(path, "manifest.json")) as f:
+        return json.load(f)
+
+
+def select_partitions(manifest, countries=None, year_range=None):
+    """Manifest entries that can hold rows in `countries` and inside the inclusive `year_range`"""
+    selected = []
+    for part in manifest["partitions"]:
+        if countries is not None and part["country"] not in countries:
+            continue
+        if year_range is not None and (
+                part["year_min"] is None or part["year_max"] < year_range[0] or part["year_min"] > year_range[1]):
+            continue
+        selected.append(part)
+    return selected
+
+
+def open_partitions(path, countries=None, year_range=None):
+    """Read only the partitions matching the predicates and return their rows in file order
+
+    `countries` is a collection of country names and `year_range` an inclusive (start, end) pair; either may
+    be None. Rows of partly covered year buckets are filtered, so the result equals filtering the full table.
+    """
+    manifest = read_manifest(path)
+    if countries is not None:
+        countries = set(countries)
+    parts = select_partitions(manifest, countries, year_range)
+
+    def column(file, dtype):
+        arrays = [np.load(os.path.join(path, part["path"], file), mmap_mode='r') for part in parts]
+        return np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+
+    row_ids = column(f"{ROW_ID}.npy", np.int64)
+    order = np.argsort(row_ids, kind='stable')
+    columns = {}
+    for col in manifest["columns"]:
+        if col in manifest["categories"]:
+            codes = column(f"{col}.codes.npy", np.int8)[order]
+            columns[col] = pd.Categorical.from_codes(
+                codes, categories=pd.Index(manifest["categories"][col]), validate=False)
+        else:
+            columns[col] = column(f"{col}.npy", np.float64)[order]
+    df = pd.DataFrame(columns, index=pd.Index(row_ids[order]), copy=False)
+
+    if year_range is not None:
+        df = df[df[PARTITION_YEAR].between(year_range[0], year_range[1])]
+    return df
+
+
+def load_partitions(csv_path, numeric, categorical, countries=None, year_range=None,
+                    partition_dir=PARTITION_DIR, store_dir=STORE_DIR):
+    """Build the partitioned layout for a CSV if needed and open the partitions matching the predicates"""
+    return open_partitions(build_partitions(csv_path, numeric, categorical, partition_dir, store_dir),
+                           countries, year_range)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from utils.trajectories import site_ids
+
+# Columns describing a site rather than a survey; each moves to the site table only if it never varies within a site
+BLEACHING_SITE_COLUMNS = ['site_id', 'latitude_degrees', 'longitude_degrees', 'country_name', 'exposure']
+RECOVERY_SITE_COLUMNS = ['site_id', 'latitude_degrees', 'longitude_degrees', 'country_name', 'region', 'depth',
+                         'management_authority']
+
+
+def normalize_sites(df, site_columns):
+    """Split a dataset into a site dimension table and a narrow observation table keyed by integer site ID
+
+    Returns (sites, observations). `sites` is indexed by site ID 0..n-1 and holds one row per site.
+    `observations` keeps the per-survey columns plus an int32 'site' column. A listed column that
+    differs between surveys of the same site stays on the observations.
+    """
+    site = site_ids(df).to_numpy()
+    site_columns = [col for col in site_columns if col in df.columns]
+    varying = df[site_columns].groupby(site, sort=False, observed=True).nunique(dropna=False).max() > 1
+    constant = [col for col in site_columns if not varying.get(col, False)]
+
+    # The first survey of each site supplies its attributes; iloc keeps categoricals dictionary-encoded
+    ids, first_rows = np.unique(site, return_index=True)
+    sites = df[constant].iloc[first_rows].set_axis(pd.Index(ids, name='site'))
+
+    columns = {'site': site.astype(np.int32)}
+    columns.update((col, df[col]) for col in df.columns if col not in constant)
+    observations = pd.DataFrame(columns, copy=False)
+    return sites, observations
+
+
+def site_values(sites, observations, column):
+    """Per-observation values of `column`, gathered from the site table through the integer site IDs"""
+    if column in observations.columns:
+        return observations[column]
+    return sites[column].iloc[observations['site'].to_numpy()].set_axis(observations.index)
+
+
+def site_mask(sites, observations, column, values):
+    """Boolean row mask of observations whose site has `column` in `values`, tested once per site"""
+    if column in observations.columns:
+        return observations[column].isin(values).to_numpy()
+    return sites[column].isin(values).to_numpy()[observations['site'].to_numpy()]
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+# Centroid budget of each digest; about COMPRESSION / 2 centroids are kept, densest in the tails
+COMPRESSION = 200
+
+
+def _scale(q, compression):
+    # t-digest k1 scale: centroids are limited to one unit of k, so they shrink towards q = 0 and q = 1
+    return compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+
+
+def _compress(group_codes, means, weights, compression):
+    """Merge centroids sorted by (group, mean) into at most ~compression / 2 centroids per group"""
+    n_groups = group_codes.max() + 1 if len(group_codes) else 0
+    totals = np.bincount(group_codes, weights=weights, minlength=n_groups)
+    cum = np.cumsum(weights)
+    group_start = np.concatenate([[0.0], np.cumsum(totals)[:-1]])
+    q_mid = (cum - group_start[group_codes] - weights / 2) / totals[group_codes]
+    buckets = np.floor(_scale(q_mid, compression)).astype(np.int64)
+
+    # A new centroid starts wherever the group or the k-bucket changes
+    starts = np.flatnonzero(np.r_[True, (np.diff(group_codes) != 0) | (np.diff(buckets) != 0)])
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+    return group_codes[starts], merged_means, merged_weights
+
+
+class TDigest:
+    """Mergeable quantile summary: weighted centroids plus the exact minimum and maximum"""
+
+    __slots__ = ("means", "weights", "min", "max")
+
+    def __init__(self, means, weights, min_value, max_value):
+        self.means = means
+        self.weights = weights
+        self.min = min_value
+        self.max = max_value
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    @property
+    def nbytes(self):
+        return self.means.nbytes + self.weights.nbytes
+
+    @classmethod
+    def merge(cls, digests, compression=COMPRESSION):
+        """Combine any number of digests into one, as if it had been built from all of their values"""
+        digests = [digest for digest in digests if digest is not None and len(digest.means)]
+        if not digests:
+            return None
+        means = np.concatenate([digest.means for digest in digests])
+        weights = np.concatenate([digest.weights for digest in digests])
+        order = np.argsort(means, kind='stable')
+        _, means, weights = _compress(np.zeros(len(means), dtype=np.int64), means[order], weights[order], compression)
+        return cls(means, weights, min(d.min for d in digests), max(d.max for d in digests))
+
+    def quantile(self, q):
+        """Estimate the quantile(s) `q` in [0, 1] by interpolating between centroid midpoints"""
+        cum = np.cumsum(self.weights)
+        positions = np.concatenate([[0.0], (cum - self.weights / 2) / cum[-1], [1.0]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q, positions, values)
+
+
+def build_digests(values, keys, compression=COMPRESSION):
+    """Build one digest per distinct row of `keys` in a single vectorized pass
+
+    Returns a Series of TDigest objects indexed by the key columns, ready to be filtered and merged with
+    `merge_digests`. Rows with a missing value or key are skipped.
+    """
+    keys = pd.DataFrame(keys).reset_index(drop=True)
+    values = np.asarray(values, dtype=float)
+    keep = ~np.isnan(values) & keys.notna().all(axis=1).to_numpy()
+    keys, values = keys[keep], values[keep]
+
+    grouped = keys.groupby(list(keys.columns), sort=True, observed=True)
+    group_codes = grouped.ngroup().to_numpy()
+    labels = grouped.size().index
+    if len(values) == 0:
+        return pd.Series([], index=labels, name='digest', dtype=object)
+    order = np.lexsort((values, group_codes))
+    group_codes, values = group_codes[order], values[order]
+
+    codes, means, weights = _compress(group_codes, values, np.ones(len(values)), compression)
+    bounds = np.searchsorted(codes, np.arange(len(labels) + 1))
+    value_bounds = np.searchsorted(group_codes, np.arange(len(labels) + 1))
+    digests = [
+        TDigest(means[lo:hi], weights[lo:hi], values[v_lo], values[v_hi - 1])
+        for lo, hi, v_lo, v_hi in zip(bounds[:-1], bounds[1:], value_bounds[:-1], value_bounds[1:])
+    ]
+    return pd.Series(digests, index=labels, name='digest')
+
+
+def merge_digests(digests, by):
+    """Merge a Series of digests up to the index level(s) `by`"""
+    return digests.groupby(level=by, observed=True).agg(TDigest.merge)
+
+
+def quantile_table(digests, quantiles):
+    """Tabulate quantiles and counts of each digest in a Series, one column per quantile (e.g. 'p90')"""
+    rows = [np.r_[digest.quantile(quantiles), digest.count] for digest in digests]
+    columns = [f"p{round(q * 100):g}" for q in quantiles] + ['count']
+    return pd.DataFrame(rows, index=digests.index, columns=columns)
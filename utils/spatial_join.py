@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from utils.trajectories import site_attributes, site_year_cover
+
+EARTH_RADIUS_KM = 6371.0
+LINK_DISTANCE_KM = 25
+LINK_WINDOW_YEARS = 5
+COORDINATES = ['latitude_degrees', 'longitude_degrees']
+
+
+def unit_vectors(lat, lon):
+    """Points on the unit sphere, so straight-line (chord) distance is monotonic in great-circle distance"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def site_coordinates(sites, observations):
+    """Latitude and longitude per site, from the site table or from each site's first survey"""
+    if all(col in sites.columns for col in COORDINATES):
+        return sites[COORDINATES]
+    return site_attributes(observations, COORDINATES).reindex(sites.index)
+
+
+def site_year_keys(sites, years):
+    """(site, year) pairs as one structured array, which numpy sorts and searches lexicographically
+
+    Comparing the two fields in order avoids packing them into a single number, which can collide or lose
+    precision for large site ids, negative years or fractional years.
+    """
+    keys = np.empty(len(sites), dtype=[('site', np.int64), ('year', np.float64)])
+    keys['site'] = sites
+    keys['year'] = years
+    return keys
+
+
+def link_sites(coords_a, coords_b, max_km):
+    """All pairs of sites in `coords_a` and `coords_b` within `max_km`; returns (index_a, index_b, distance_km)"""
+    valid_a = np.flatnonzero(coords_a.notnull().all(axis=1).to_numpy())
+    valid_b = np.flatnonzero(coords_b.notnull().all(axis=1).to_numpy())
+    tree_a = cKDTree(unit_vectors(*coords_a.to_numpy(dtype=float)[valid_a].T))
+    tree_b = cKDTree(unit_vectors(*coords_b.to_numpy(dtype=float)[valid_b].T))
+    # Search both trees together with the chord length matching the great-circle radius
+    chord = 2 * np.sin(max_km / (2 * EARTH_RADIUS_KM))
+    pairs = tree_a.sparse_distance_matrix(tree_b, chord, output_type='ndarray')
+    distance_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(pairs['v'] / 2, 1))
+    return valid_a[pairs['i']], valid_b[pairs['j']], distance_km
+
+
+def link_bleaching_to_recovery(bleaching_sites, bleaching, recovery_sites, recovery,
+                               max_km=LINK_DISTANCE_KM, window_years=LINK_WINDOW_YEARS):
+    """Match every bleaching survey to the recovery sites within `max_km` and their surveys in the following years
+
+    `bleaching` and `recovery` are observation tables keyed by integer site (see utils.sites). A bleaching
+    survey in year Y links to a recovery site when that site has surveys in Y..Y + window_years. Each link
+    records the first and last of those surveys and the annual change in hard coral cover between them.
+    """
+    site_a, site_b, distance_km = link_sites(
+        site_coordinates(bleaching_sites, bleaching), site_coordinates(recovery_sites, recovery), max_km)
+    site_a = bleaching_sites.index.to_numpy()[site_a]
+    site_b = recovery_sites.index.to_numpy()[site_b]
+
+    # Bleaching surveys grouped by site, so each site pair expands to that site's surveys without a loop
+    surveys = pd.DataFrame({
+        'site': bleaching['site'].to_numpy(),
+        'year': bleaching['date_year'].to_numpy(dtype=float),
+        'severity': bleaching['percent_bleaching'].to_numpy(dtype=float),
+    }).dropna().sort_values(['site', 'year'], kind='stable')
+    survey_sites = surveys['site'].to_numpy()
+    first = np.searchsorted(survey_sites, site_a, side='left')
+    counts = np.searchsorted(survey_sites, site_a, side='right') - first
+    pair = np.repeat(np.arange(len(site_a)), counts)
+    rows = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    # Sorted (site, year) index of recovery cover: the window is one pair of binary searches per link
+    cover = site_year_cover(recovery)
+    cover_key = site_year_keys(cover['site'].to_numpy(), cover['year'].to_numpy())
+    years = surveys['year'].to_numpy()[rows]
+    lo = np.searchsorted(cover_key, site_year_keys(site_b[pair], years), side='left')
+    hi = np.searchsorted(cover_key, site_year_keys(site_b[pair], years + window_years), side='right')
+    found = hi > lo
+    pair, rows, lo, hi = pair[found], rows[found], lo[found], hi[found]
+
+    cover_years = cover['year'].to_numpy()
+    cover_values = cover['cover'].to_numpy()
+    links = pd.DataFrame({
+        'bleaching_site': survey_sites[rows],
+        'bleaching_year': years[found],
+        'percent_bleaching': surveys['severity'].to_numpy()[rows],
+        'recovery_site': site_b[pair],
+        'distance_km': distance_km[pair],
+        'start_year': cover_years[lo],
+        'start_cover': cover_values[lo],
+        'end_year': cover_years[hi - 1],
+        'end_cover': cover_values[hi - 1],
+        'surveys': hi - lo,
+    })
+    span = links['end_year'] - links['start_year']
+    links['annual_recovery_rate'] = (links['end_cover'] - links['start_cover']) / span.where(span > 0)
+    return links
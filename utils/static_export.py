@@ -0,0 +1,214 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timezone
+
+from plotly.offline import get_plotlyjs
+
+from utils.assets import ASSET_DIR, picture_html, variant_files
+from utils.fingerprint import data_fingerprint
+from utils.page_content import PAGE
+from utils.styling import palette
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Guardians of the Sea: Coral Reefs</title>
+<script src="assets/{plotly_js}"></script>
+<style>
+body {{ margin: 0 auto; max-width: 1200px; padding: 0 24px; font-family: sans-serif; font-size: 24px;
+       color: {deep_blue}; background: linear-gradient(0deg, white 0%, {sky_blue} 100%); }}
+h1, h2, h3 {{ text-align: center; text-shadow: 1px 1px 2px rgba(0,0,0,0.25); }}
+h1 {{ font-size: 52px; }}
+h2 {{ font-size: 36px; }}
+h3 {{ font-size: 30px; }}
+a {{ background: {deep_blue}; color: {off_white}; border-radius: 8px; padding: 6px 12px; text-decoration: none; }}
+a:hover {{ background: {turquoise}; }}
+hr {{ margin: 32px 0; border: none; border-top: 1px solid rgba(0,63,92,0.2); }}
+.hero {{ margin: 0 auto; width: 75%; }}
+.hero img {{ width: 100%; height: auto; border-radius: 15px; }}
+.info {{ padding: 16px; border-radius: 8px; background: rgba(28,131,225,0.1); color: black; font-size: 20px; }}
+.columns, .logos {{ display: flex; gap: 24px; }}
+.columns > div, .logos > div {{ flex: 1; }}
+</style>
+</head>
+<body>
+{blocks}
+<script>
+document.querySelectorAll("[data-figure]").forEach(function (el) {{
+  fetch("assets/" + el.dataset.figure)
+    .then(function (response) {{ return response.json(); }})
+    .then(function (fig) {{ fig.config = {{responsive: true}}; Plotly.newPlot(el, fig); }});
+}});
+</script>
+</body>
+</html>
+"""
+
+SECTION_TEMPLATE = """<section>
+<h2>{heading}</h2>
+{intro}<div data-figure="{asset}"></div>
+{caption}
+</section>"""
+
+INLINE_MARKUP = [
+    (re.compile(r"\[([^\]]+)\]\(([^)]+)\)"), r'<a href="\2">\1</a>'),
+    (re.compile(r"\*\*(.+?)\*\*(?!\*)"), r"<strong>\1</strong>"),
+    (re.compile(r"\*(.+?)\*"), r"<em>\1</em>"),
+]
+
+
+def _inline(text):
+    text = html.escape(text.strip(), quote=False)
+    for pattern, replacement in INLINE_MARKUP:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def markdown_to_html(text):
+    """Convert the markdown used in the page content (headings, paragraphs, "-" lists, bold, italics, links)"""
+    out, paragraph, items = [], [], []
+
+    def flush():
+        if paragraph:
+            out.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+        if items:
+            out.append("<ul>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + "</ul>")
+            items.clear()
+
+    for line in text.strip().splitlines():
+        line = line.strip()
+        heading = re.match(r"(#{1,6}) (.*)", line)
+        if not line:
+            flush()
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif line.startswith("- "):
+            if paragraph:
+                flush()
+            items.append(line[2:])
+        else:
+            if items:
+                flush()
+            paragraph.append(line)
+    flush()
+    return "\n".join(out)
+
+
+def write_hashed_asset(assets_dir, stem, suffix, content):
+    """Write bytes under a content-hashed file name and return that name"""
+    name = f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{suffix}"
+    path = os.path.join(assets_dir, name)
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(content)
+    return name
+
+
+def read_manifest(out_dir):
+    """Return the manifest of an existing bundle, or None if there is none"""
+    try:
+        with open(os.path.join(out_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def export_static_site(out_dir="dist", if_changed=False):
+    """Render the story page (utils/page_content.py) into a static HTML/JSON bundle; returns the manifest"""
+    fingerprint = data_fingerprint()
+    previous = read_manifest(out_dir)
+    if if_changed and previous and previous.get("data_fingerprint") == fingerprint:
+        return previous
+
+    # Build into a staging directory so a half-written bundle is never served
+    staging_dir = f"{out_dir}.tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    assets_dir = os.path.join(staging_dir, "assets")
+    os.makedirs(assets_dir)
+
+    assets = {
+        "plotly_js": write_hashed_asset(assets_dir, "plotly", ".min.js", get_plotlyjs().encode()),
+    }
+
+    def image_html(source, width=None, alt=""):
+        # Ship the resized WebP/fallback variants from utils.assets; the raw source only if it has none
+        picture = picture_html(source, width, alt, url="assets")
+        if picture is not None:
+            for name in variant_files(source):
+                shutil.copyfile(os.path.join(ASSET_DIR, name), os.path.join(assets_dir, name))
+            assets[source] = variant_files(source)
+            return picture
+        with open(source, "rb") as f:
+            stem, suffix = os.path.splitext(os.path.basename(source))
+            assets[source] = write_hashed_asset(assets_dir, stem, suffix, f.read())
+        size = f' width="{width}"' if width else ""
+        return f'<img src="assets/{assets[source]}"{size} alt="{html.escape(alt)}">'
+
+    blocks = []
+    for block in PAGE:
+        kind = block["kind"]
+        if kind == "title":
+            blocks.append(f"<h1>{html.escape(block['text'])}</h1>")
+        elif kind == "image":
+            blocks.append(f'<div class="hero">{image_html(block["source"], alt=block["alt"])}</div>')
+        elif kind == "markdown":
+            blocks.append(markdown_to_html(block["text"]))
+        elif kind == "info":
+            blocks.append(f'<div class="info">{markdown_to_html(block["text"])}</div>')
+        elif kind == "columns":
+            blocks.append('<div class="columns">' + "".join(
+                f"<div>{markdown_to_html(text)}</div>" for text in block["texts"]) + "</div>")
+        elif kind == "divider":
+            blocks.append("<hr>")
+        elif kind == "logos":
+            blocks.append('<div class="logos">' + "".join(
+                f'<div>{image_html(source, block["width"])}</div>' for source in block["sources"]) + "</div>")
+        elif kind == "chart":
+            # Charts are exported with their builders' default arguments, i.e. the widgets' initial state
+            fig = block["builder"]()
+            assets[block["key"]] = write_hashed_asset(assets_dir, block["key"], ".json", fig.to_json().encode())
+            blocks.append(SECTION_TEMPLATE.format(
+                heading=html.escape(block["heading"]),
+                intro=markdown_to_html(block["intro"]) + "\n" if "intro" in block else "",
+                asset=assets[block["key"]],
+                caption=markdown_to_html(block["caption"]),
+            ))
+
+    with open(os.path.join(staging_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(PAGE_TEMPLATE.format(plotly_js=assets["plotly_js"], blocks="\n".join(blocks), **palette))
+
+    manifest = {
+        "data_fingerprint": fingerprint,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "assets": assets,
+    }
+    with open(os.path.join(staging_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(staging_dir, out_dir)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the coral reef story page as a static bundle.")
+    parser.add_argument("--out", default="dist", help="output directory (default: dist)")
+    parser.add_argument("--if-changed", action="store_true",
+                        help="skip the export when the data fingerprint matches the existing bundle")
+    args = parser.parse_args()
+
+    manifest = export_static_site(args.out, if_changed=args.if_changed)
+    print(f"Static bundle for data {manifest['data_fingerprint'][:12]} written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
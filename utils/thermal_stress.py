@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from utils.sites import site_values
+
+# Thermal Stress Anomaly is the primary signal; the others are scored the same way when present
+STRESS_METRICS = ['tsa_mean', 'ssta_mean', 'temperature_mean']
+BASELINE_YEARS = 10
+MIN_BASELINE_YEARS = 3
+ANOMALY_Z = 2.0
+
+
+def _year_dates(years):
+    # Rolling windows measured in time rather than rows, so irregular survey gaps are handled correctly
+    return pd.to_datetime(pd.DataFrame({'year': years.astype(int), 'month': 1, 'day': 1}))
+
+
+def rolling_zscores(frame, key, value, baseline_years=BASELINE_YEARS, min_years=MIN_BASELINE_YEARS):
+    """Z-score of `value` against the same group's trailing baseline of the previous `baseline_years`
+
+    `frame` holds one row per (key, year). The baseline excludes the current year, so a stress spike is
+    compared only with what came before it. Years with fewer than `min_years` of history score NaN.
+    """
+    frame = frame.sort_values([key, 'year'], kind='stable').reset_index(drop=True)
+    frame['date'] = _year_dates(frame['year'])
+    # One spare day so the window still reaches January 1st of year - baseline_years across leap years
+    window = pd.Timedelta(days=round(baseline_years * 365.25) + 1)
+    rolling = frame.groupby(key, sort=False).rolling(window, on='date', closed='left', min_periods=min_years)[value]
+    # Grouped rolling results come back keyed by (group, row); the frame is already in that order
+    frame['baseline_mean'] = rolling.mean().to_numpy()
+    frame['baseline_std'] = rolling.std().to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        frame['zscore'] = (frame[value] - frame['baseline_mean']) / frame['baseline_std'].where(frame['baseline_std'] > 0)
+    return frame.drop(columns='date')
+
+
+def _site_column(sites, observations, column):
+    if column in sites.columns or column in observations.columns:
+        return site_values(sites, observations, column).astype(object).to_numpy()
+    return np.full(len(observations), 'All', dtype=object)
+
+
+def detect_thermal_anomalies(sites, observations, metric=None, baseline_years=BASELINE_YEARS, threshold=ANOMALY_Z):
+    """Score thermal stress per (site, year) and per (region, year) against trailing baselines
+
+    Returns {'metric', 'site', 'region'}; each table has the yearly value, its baseline, the z-score and an
+    'anomaly' flag for years at least `threshold` standard deviations above the baseline. Returns None if
+    the observations hold none of the STRESS_METRICS.
+    """
+    metric = metric or next((col for col in STRESS_METRICS if col in observations.columns), None)
+    if metric is None:
+        return None
+    stress = pd.DataFrame({
+        'site': observations['site'].to_numpy(),
+        'year': pd.to_numeric(observations['date_year'], errors='coerce').to_numpy(),
+        'value': pd.to_numeric(observations[metric], errors='coerce').to_numpy(),
+        'region': _site_column(sites, observations, 'region'),
+        'country_name': _site_column(sites, observations, 'country_name'),
+    }).dropna(subset=['year', 'value'])
+
+    by_site = stress.groupby(['site', 'year'], sort=False).agg(
+        value=('value', 'mean'), region=('region', 'first'), country_name=('country_name', 'first')).reset_index()
+    site_scores = rolling_zscores(by_site, 'site', 'value', baseline_years)
+    site_scores['anomaly'] = site_scores['zscore'] >= threshold
+
+    by_region = stress.groupby(['region', 'year'], sort=False, observed=True)['value'].mean().reset_index()
+    region_scores = rolling_zscores(by_region, 'region', 'value', baseline_years)
+    region_scores['anomaly'] = region_scores['zscore'] >= threshold
+    # Share of the region's scored sites that were anomalous that year
+    scored = site_scores.dropna(subset=['zscore'])
+    share = scored.groupby(['region', 'year'], observed=True)['anomaly'].mean().rename('site_share')
+    region_scores = region_scores.join(share, on=['region', 'year'])
+    return {'metric': metric, 'site': site_scores, 'region': region_scores}
+
+
+def stress_events(region_scores, max_events=4):
+    """Group anomalous region-years into runs of consecutive years and return the strongest runs in time order"""
+    anomalies = region_scores[region_scores['anomaly']]
+    if anomalies.empty:
+        return pd.DataFrame(columns=['start_year', 'end_year', 'regions', 'peak_zscore', 'site_share'])
+    years = anomalies.groupby('year').agg(
+        peak_zscore=('zscore', 'max'),
+        site_share=('site_share', 'mean'),
+        regions=('region', lambda r: sorted(map(str, set(r)))),
+    ).sort_index()
+    run = (np.diff(years.index.to_numpy(), prepend=-np.inf) > 1).cumsum()
+    events = years.groupby(run).agg(
+        start_year=('peak_zscore', lambda z: z.index.min()),
+        end_year=('peak_zscore', lambda z: z.index.max()),
+        peak_zscore=('peak_zscore', 'max'),
+        site_share=('site_share', 'mean'),
+        regions=('regions', lambda r: sorted(set().union(*r))),
+    )
+    return events.nlargest(max_events, 'peak_zscore').sort_values('start_year').reset_index(drop=True)
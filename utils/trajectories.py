@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# A site is disturbed when it loses at least this share of its hard coral cover between surveys
+DISTURBANCE_DROP = 0.3
+DEPTH_BANDS = [0, 5, 10, 20, np.inf]
+DEPTH_LABELS = ['0-5 m', '5-10 m', '10-20 m', '>20 m']
+
+
+def site_ids(df):
+    """Integer site ID per row, from site_id when present and from rounded coordinates otherwise"""
+    if 'site' in df.columns:
+        # Already normalized (see utils.sites)
+        return df['site']
+    if 'site_id' in df.columns:
+        return pd.Series(pd.factorize(df['site_id'], use_na_sentinel=False)[0], index=df.index)
+    coords = [df['latitude_degrees'].round(4), df['longitude_degrees'].round(4)]
+    return df.groupby(coords, sort=False, dropna=False).ngroup()
+
+
+def observation_years(df):
+    """Survey year per row, from date_year when present and from the survey date otherwise"""
+    if 'date_year' in df.columns:
+        return pd.to_numeric(df['date_year'], errors='coerce')
+    return pd.to_datetime(df['date'], errors='coerce').dt.year
+
+
+def site_year_cover(df):
+    """Mean hard coral cover per site and year, sorted by site then year"""
+    observations = pd.DataFrame({
+        'site': site_ids(df),
+        'year': observation_years(df),
+        'cover': pd.to_numeric(df['percent_hard_coral_cover'], errors='coerce'),
+    }).dropna()
+    return observations.groupby(['site', 'year'], sort=True)['cover'].mean().reset_index()
+
+
+def compute_trajectories(df, disturbance_drop=DISTURBANCE_DROP):
+    """Find disturbance events per site and measure the recovery that follows each one
+
+    Returns one row per event with the cover before and after the disturbance, whether and when the site
+    regained its pre-disturbance cover, and the annualized recovery rate in percentage points per year.
+    """
+    cover = site_year_cover(df)
+    by_site = cover.groupby('site', sort=False)
+
+    # Change since the previous survey of the same site
+    cover['prev_cover'] = by_site['cover'].shift()
+    cover['prev_year'] = by_site['year'].shift()
+    cover['drop'] = cover['prev_cover'] - cover['cover']
+    cover['disturbed'] = cover['drop'] >= disturbance_drop * cover['prev_cover']
+    cover.loc[cover['prev_cover'] <= 0, 'disturbed'] = False
+
+    # Every survey belongs to the most recent disturbance at its site (0 = before any disturbance)
+    cover['event'] = cover.groupby('site', sort=False)['disturbed'].cumsum()
+    cover = cover[cover['event'] > 0].copy()
+    segment = cover.groupby(['site', 'event'], sort=False)
+
+    # Carry each event's baseline and disturbance year to the surveys that follow it
+    cover['baseline'] = segment['prev_cover'].transform('first')
+    cover['disturbance_year'] = segment['year'].transform('first')
+    cover['disturbed_cover'] = segment['cover'].transform('first')
+    after = cover['year'] > cover['disturbance_year']
+    cover['recovered'] = after & (cover['cover'] >= cover['baseline'])
+
+    # First survey back at the baseline, or the last survey of the segment if it never got there
+    recovered_year = cover['year'].where(cover['recovered']).groupby([cover['site'], cover['event']], sort=False).min()
+    events = segment.agg(
+        disturbance_year=('year', 'first'),
+        pre_disturbance_year=('prev_year', 'first'),
+        baseline_cover=('prev_cover', 'first'),
+        disturbed_cover=('cover', 'first'),
+        last_year=('year', 'last'),
+        last_cover=('cover', 'last'),
+        surveys=('cover', 'size'),
+    )
+    events['recovery_year'] = recovered_year
+    events['recovered'] = events['recovery_year'].notnull()
+    events['years_to_recover'] = events['recovery_year'] - events['disturbance_year']
+
+    end = cover.set_index(['site', 'year'])['cover']
+    events['end_year'] = events['recovery_year'].fillna(events['last_year'])
+    end_index = pd.MultiIndex.from_arrays([events.index.get_level_values('site'), events['end_year']])
+    events['end_cover'] = end.reindex(end_index).to_numpy()
+
+    events['drop'] = events['baseline_cover'] - events['disturbed_cover']
+    events['relative_drop'] = events['drop'] / events['baseline_cover']
+    span = events['end_year'] - events['disturbance_year']
+    events['annual_recovery_rate'] = (events['end_cover'] - events['disturbed_cover']) / span.where(span > 0)
+    return events.reset_index()
+
+
+def site_attributes(df, columns):
+    """First recorded value of each attribute per site"""
+    attributes = df[[col for col in columns if col in df.columns]].copy()
+    attributes['site'] = site_ids(df)
+    return attributes.groupby('site', sort=False).first()
+
+
+def depth_bands(depth):
+    return pd.cut(depth, DEPTH_BANDS, labels=DEPTH_LABELS, right=False)
+
+
+def summarize_recovery(events, by):
+    """Recovery statistics of disturbance events per group"""
+    grouped = events.groupby(by, observed=True)
+    summary = grouped.agg(
+        events=('annual_recovery_rate', 'size'),
+        sites=('site', 'nunique'),
+        share_recovered=('recovered', 'mean'),
+        median_years_to_recover=('years_to_recover', 'median'),
+        median_recovery_rate=('annual_recovery_rate', 'median'),
+        mean_recovery_rate=('annual_recovery_rate', 'mean'),
+        mean_drop=('drop', 'mean'),
+    )
+    return summary.reset_index()
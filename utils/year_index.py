@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+
+class YearRangeIndex:
+    """Cumulative sums and counts per (group, year), answering any contiguous year range in O(1) per group"""
+
+    def __init__(self, groups, years, cum_sums, cum_counts):
+        self.groups = groups
+        self.years = years
+        # metric -> array of shape (groups, years + 1), with a leading zero column
+        self.cum_sums = cum_sums
+        self.cum_counts = cum_counts
+
+    @classmethod
+    def from_aggregate(cls, aggregate, group_keys, year_key='date_year', metrics=None):
+        """Build the index from a partial aggregate (see utils.ingest) keyed by `group_keys` and `year_key`"""
+        group_keys = list(group_keys)
+        metrics = metrics or list(dict.fromkeys(col[0] for col in aggregate.columns))
+        levels = group_keys + [year_key]
+        sums = aggregate.xs('sum', axis=1, level=1)[metrics].groupby(level=levels).sum()
+        counts = aggregate.xs('count', axis=1, level=1)[metrics].groupby(level=levels).sum()
+
+        observed_years = sums.index.get_level_values(year_key).astype(int)
+        years = np.arange(observed_years.min(), observed_years.max() + 1)
+        sums.index = sums.index.set_levels(sums.index.levels[-1].astype(int), level=-1)
+        counts.index = sums.index
+
+        cum_sums, cum_counts = {}, {}
+        groups = None
+        for metric in metrics:
+            # Dense group x year grid with zeros for missing years, then a running total along the years
+            grid_sums = sums[metric].unstack(year_key, fill_value=0).reindex(columns=years, fill_value=0)
+            grid_counts = counts[metric].unstack(year_key, fill_value=0).reindex(columns=years, fill_value=0)
+            groups = grid_sums.index
+            cum_sums[metric] = np.pad(np.cumsum(grid_sums.to_numpy(dtype=float), axis=1), ((0, 0), (1, 0)))
+            cum_counts[metric] = np.pad(np.cumsum(grid_counts.to_numpy(dtype=np.int64), axis=1), ((0, 0), (1, 0)))
+        return cls(groups, years, cum_sums, cum_counts)
+
+    def _bounds(self, start, end):
+        lo = np.searchsorted(self.years, start, side='left')
+        hi = np.searchsorted(self.years, end, side='right')
+        return lo, max(lo, hi)
+
+    def range_stats(self, metric, start=None, end=None):
+        """Sum, count and mean of `metric` per group over the years start..end (inclusive)"""
+        lo, hi = self._bounds(self.years[0] if start is None else start, self.years[-1] if end is None else end)
+        total = self.cum_sums[metric][:, hi] - self.cum_sums[metric][:, lo]
+        count = self.cum_counts[metric][:, hi] - self.cum_counts[metric][:, lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / count, np.nan)
+        return pd.DataFrame({'sum': total, 'count': count, 'mean': mean}, index=self.groups)